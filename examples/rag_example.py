@@ -55,12 +55,14 @@ def main():
     print("\n2. Adding knowledge to the knowledge base...")
     chunks = chunk_text(SAMPLE_KNOWLEDGE, chunk_size=300, overlap=50)
     
-    for i, chunk in enumerate(chunks, 1):
-        agent.add_to_knowledge_base(
-            chunk,
-            metadata={"source": "introduction", "chunk_id": i}
-        )
-    
+    agent.add_documents(
+        chunks,
+        metadatas=[
+            {"source": "introduction", "chunk_id": i}
+            for i, _ in enumerate(chunks, 1)
+        ]
+    )
+
     print(f"   Added {len(chunks)} chunks to knowledge base")
     
     # Research with RAG
@@ -67,10 +67,11 @@ def run_verification():
         print(f"    ✗ Model selection failed: {e}")
         tests_failed += 1
     
-    # Test 5: Create ResearchAgent
+    # Test 5: Create ResearchAgent (reusing the ModelManager from test 3
+    # so the manager's init cost is paid once per run)
     print("\n[5/8] Testing ResearchAgent creation...")
     try:
-        agent = ResearchAgent()
+        agent = ResearchAgent(model_manager=manager)
         assert agent.model_manager is not None
         assert agent.config is not None
         print("    ✓ ResearchAgent created successfully")
@@ -3,43 +3,149 @@ Analyzer module for LLM-based synthesis of research findings.
 Supports Groq (Llama), HuggingFace, and Google Gemini APIs.
 """
 
+import asyncio
+import hashlib
+import io
 import os
 import logging
+from collections import OrderedDict
 from typing import List, Dict, Any, Optional
 import json
+import re
+from functools import lru_cache
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# LLM responses often wrap the JSON payload in markdown code fences
+_CODE_FENCE_RE = re.compile(r'^```(?:json)?\s*|\s*```$')
+
+# Analysis prompt templates, hoisted to module scope so per-call prompt
+# construction is a single str.format over two fields.
+GROQ_ANALYZE_PROMPT = """You are a research analyst. Analyze the following research data about "{query}" and provide a comprehensive synthesis.
+
+Research Data:
+{context}
+
+Provide a structured analysis with:
+1. Key Findings (3-5 main points)
+2. Trends and Patterns
+3. Notable Papers/Projects (if applicable)
+4. Recommendations for further exploration
+5. Summary
+
+Format your response as JSON with these sections."""
+
+GEMINI_ANALYZE_PROMPT = """Analyze the following research data about "{query}" and provide a comprehensive synthesis.
+
+{context}
+
+Provide:
+1. Key Findings (3-5 main points)
+2. Trends and Patterns
+3. Notable Papers/Projects
+4. Recommendations
+5. Summary"""
+
+
+@lru_cache(maxsize=4)
+def _get_groq_client(api_key: str):
+    """Create (or reuse) the Groq client for an API key."""
+    from groq import Groq
+    return Groq(api_key=api_key)
+
+
+@lru_cache(maxsize=4)
+def _get_huggingface_client(api_key: str):
+    """Create (or reuse) the HuggingFace inference client for an API key."""
+    from huggingface_hub import InferenceClient
+    return InferenceClient(token=api_key)
+
+
+@lru_cache(maxsize=4)
+def _get_gemini_model(api_key: str):
+    """Create (or reuse) the Gemini model for an API key."""
+    import google.generativeai as genai
+    genai.configure(api_key=api_key)
+    return genai.GenerativeModel('gemini-pro')
+
+
+# Memoized contexts keyed by content hash; provider fallthrough calls
+# prepare_context repeatedly with the same scraped data.
+_CONTEXT_CACHE: "OrderedDict[str, str]" = OrderedDict()
+_CONTEXT_CACHE_SIZE = 128
+
+
+def _context_cache_key(data: Dict[str, List[Dict[str, Any]]], max_items: int) -> str:
+    """Build a stable content-hash key for a scraped-data dict."""
+    payload = json.dumps(data, sort_keys=True, default=str).encode('utf-8')
+    return f"{hashlib.blake2b(payload, digest_size=16).hexdigest()}:{max_items}"
+
 
 def prepare_context(data: Dict[str, List[Dict[str, Any]]], max_items: int = 20) -> str:
-    """Prepare context from scraped data."""
-    context = []
-    
-    if data.get('papers'):
-        context.append("PAPERS:")
-        for i, paper in enumerate(data['papers'][:max_items], 1):
-            context.append(f"{i}. {paper.get('title', 'N/A')}")
-            context.append(f"   Authors: {', '.join(paper.get('authors', [])[:3])}")
-            context.append(f"   Summary: {paper.get('summary', '')[:200]}")
-    
-    if data.get('repositories'):
-        context.append("\nREPOSITORIES:")
-        for i, repo in enumerate(data['repositories'][:max_items], 1):
-            context.append(f"{i}. {repo.get('title', 'N/A')} ({repo.get('stars', 0)} stars)")
-            context.append(f"   {repo.get('description', '')[:150]}")
-    
-    if data.get('news'):
-        context.append("\nNEWS & ARTICLES:")
-        for i, item in enumerate(data['news'][:max_items], 1):
-            context.append(f"{i}. {item.get('title', 'N/A')}")
-    
-    if data.get('discussions'):
-        context.append("\nDISCUSSIONS:")
-        for i, disc in enumerate(data['discussions'][:max_items], 1):
-            context.append(f"{i}. {disc.get('title', 'N/A')} ({disc.get('score', 0)} score)")
-    
-    return "\n".join(context)[:8000]  # Limit context size
+    """Prepare context from scraped data (memoized by content hash)."""
+    key = _context_cache_key(data, max_items)
+    cached = _CONTEXT_CACHE.get(key)
+    if cached is not None:
+        _CONTEXT_CACHE.move_to_end(key)
+        return cached
+
+    context = _build_context(data, max_items)
+
+    _CONTEXT_CACHE[key] = context
+    if len(_CONTEXT_CACHE) > _CONTEXT_CACHE_SIZE:
+        _CONTEXT_CACHE.popitem(last=False)
+
+    return context
+
+
+_CONTEXT_MAX_CHARS = 8000
+
+# (data key, section header, per-item formatter) table driving
+# _build_context; adding a section is one more row here.
+_CONTEXT_SECTIONS = (
+    ('papers', 'PAPERS:',
+     lambda i, p: (f"\n{i}. {p.get('title', 'N/A')}"
+                   f"\n   Authors: {', '.join(p.get('authors', [])[:3])}"
+                   f"\n   Summary: {p.get('summary', '')[:200]}")),
+    ('repositories', '\nREPOSITORIES:',
+     lambda i, r: (f"\n{i}. {r.get('title', 'N/A')} ({r.get('stars', 0)} stars)"
+                   f"\n   {r.get('description', '')[:150]}")),
+    ('news', '\nNEWS & ARTICLES:',
+     lambda i, n: f"\n{i}. {n.get('title', 'N/A')}"),
+    ('discussions', '\nDISCUSSIONS:',
+     lambda i, d: f"\n{i}. {d.get('title', 'N/A')} ({d.get('score', 0)} score)"),
+)
+
+
+def _build_context(data: Dict[str, List[Dict[str, Any]]], max_items: int) -> str:
+    """Build the context string from scraped data.
+
+    Drives a single StringIO loop from the _CONTEXT_SECTIONS table and
+    stops as soon as the context-size budget is reached, instead of
+    assembling every section only to slice the result down afterwards.
+    """
+    buf = io.StringIO()
+    write = buf.write
+
+    for key, header, format_item in _CONTEXT_SECTIONS:
+        items = data.get(key)
+        if not items:
+            continue
+        write(f"\n{header}" if buf.tell() else header)
+        for i, item in enumerate(items[:max_items], 1):
+            write(format_item(i, item))
+            if buf.tell() >= _CONTEXT_MAX_CHARS:
+                return buf.getvalue()[:_CONTEXT_MAX_CHARS]
+
+    return buf.getvalue()[:_CONTEXT_MAX_CHARS]
 
 
 def fallback_analysis(data: Dict[str, List[Dict[str, Any]]], query: str) -> Dict[str, Any]:
@@ -52,9 +158,15 @@ def fallback_analysis(data: Dict[str, List[Dict[str, Any]]], query: str) -> Dict
             items.append(f"Paper: {data['papers'][0].get('title', 'N/A')}")
         
         if data.get('repositories'):
-            top_repo = max(data['repositories'], key=lambda x: x.get('stars', 0), default=None)
+            # Single-pass argmax; avoids a lambda invocation per repo
+            top_repo = None
+            top_stars = -1
+            for repo in data['repositories']:
+                stars = repo.get('stars', 0)
+                if stars > top_stars:
+                    top_stars, top_repo = stars, repo
             if top_repo:
-                items.append(f"Repository: {top_repo.get('title', 'N/A')} ({top_repo.get('stars', 0)} stars)")
+                items.append(f"Repository: {top_repo.get('title', 'N/A')} ({top_stars} stars)")
         
         return items
     
@@ -85,8 +197,7 @@ class GroqAnalyzer:
         
         if self.api_key:
             try:
-                from groq import Groq
-                self.client = Groq(api_key=self.api_key)
+                self.client = _get_groq_client(self.api_key)
                 logger.info("Groq API initialized")
             except Exception as e:
                 logger.error(f"Failed to initialize Groq: {e}")
@@ -100,20 +211,7 @@ class GroqAnalyzer:
         try:
             # Prepare context from data
             context = prepare_context(data)
-            
-            prompt = f"""You are a research analyst. Analyze the following research data about "{query}" and provide a comprehensive synthesis.
-
-Research Data:
-{context}
-
-Provide a structured analysis with:
-1. Key Findings (3-5 main points)
-2. Trends and Patterns
-3. Notable Papers/Projects (if applicable)
-4. Recommendations for further exploration
-5. Summary
-
-Format your response as JSON with these sections."""
+            prompt = self._build_prompt(query, context)
 
             response = self.client.chat.completions.create(
                 model="llama-3.3-70b-versatile",
@@ -121,13 +219,13 @@ Format your response as JSON with these sections."""
                 temperature=0.7,
                 max_tokens=2000
             )
-            
+
             content = response.choices[0].message.content
             
-            # Try to parse as JSON, otherwise return as text
+            # Try to parse as JSON (orjson when available), otherwise return as text
             try:
-                analysis = json.loads(content)
-            except json.JSONDecodeError:
+                analysis = _json_loads(_CODE_FENCE_RE.sub('', content))
+            except ValueError:
                 analysis = {
                     "key_findings": [],
                     "trends": content,
@@ -135,14 +233,45 @@ Format your response as JSON with these sections."""
                     "recommendations": [],
                     "summary": content[:500]
                 }
-            
+
             logger.info("Groq analysis completed")
             return analysis
-            
+
         except Exception as e:
             logger.error(f"Error with Groq analysis: {e}")
             return fallback_analysis(data, query)
 
+    def analyze_stream(self, data: Dict[str, List[Dict[str, Any]]], query: str):
+        """Stream analysis text from Groq as it is generated.
+
+        Yields text chunks as the provider produces them, so callers can
+        start downstream work at first-token time instead of waiting for
+        the full completion.
+        """
+        if not self.client:
+            logger.warning("Groq client not available")
+            return
+
+        context = prepare_context(data)
+        prompt = self._build_prompt(query, context)
+
+        response = self.client.chat.completions.create(
+            model="llama-3.3-70b-versatile",
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0.7,
+            max_tokens=2000,
+            stream=True
+        )
+
+        for chunk in response:
+            delta = chunk.choices[0].delta.content
+            if delta:
+                yield delta
+
+    def _build_prompt(self, query: str, context: str) -> str:
+        """Build the analysis prompt."""
+        return GROQ_ANALYZE_PROMPT.format(query=query, context=context)
+
 
 class HuggingFaceAnalyzer:
     """Analyzer using HuggingFace Inference API."""
@@ -153,8 +282,7 @@ class HuggingFaceAnalyzer:
         
         if self.api_key:
             try:
-                from huggingface_hub import InferenceClient
-                self.client = InferenceClient(token=self.api_key)
+                self.client = _get_huggingface_client(self.api_key)
                 logger.info("HuggingFace API initialized")
             except Exception as e:
                 logger.error(f"Failed to initialize HuggingFace: {e}")
@@ -198,9 +326,7 @@ class GeminiAnalyzer:
         
         if self.api_key:
             try:
-                import google.generativeai as genai
-                genai.configure(api_key=self.api_key)
-                self.model = genai.GenerativeModel('gemini-pro')
+                self.model = _get_gemini_model(self.api_key)
                 logger.info("Gemini API initialized")
             except Exception as e:
                 logger.error(f"Failed to initialize Gemini: {e}")
@@ -213,32 +339,52 @@ class GeminiAnalyzer:
         
         try:
             context = prepare_context(data)
-            
-            prompt = f"""Analyze the following research data about "{query}" and provide a comprehensive synthesis.
+            prompt = self._build_prompt(query, context)
 
-{context}
+            # Consume the response as a stream: the summary window is
+            # finalized at 500 chars and the full text is accumulated
+            # once, instead of materializing response.text twice and
+            # re-slicing it.
+            trends_buf = io.StringIO()
+            summary = ""
+            for chunk in self.model.generate_content(prompt, stream=True):
+                text = chunk.text
+                if not text:
+                    continue
+                trends_buf.write(text)
+                if len(summary) < 500:
+                    summary = (summary + text)[:500]
 
-Provide:
-1. Key Findings (3-5 main points)
-2. Trends and Patterns
-3. Notable Papers/Projects
-4. Recommendations
-5. Summary"""
-
-            response = self.model.generate_content(prompt)
-            
             return {
                 "key_findings": [],
-                "trends": response.text,
+                "trends": trends_buf.getvalue(),
                 "notable_items": [],
                 "recommendations": [],
-                "summary": response.text[:500]
+                "summary": summary
             }
-            
+
         except Exception as e:
             logger.error(f"Error with Gemini analysis: {e}")
             return fallback_analysis(data, query)
 
+    def analyze_stream(self, data: Dict[str, List[Dict[str, Any]]], query: str):
+        """Stream analysis text from Gemini as it is generated."""
+        if not self.model:
+            logger.warning("Gemini model not available")
+            return
+
+        context = prepare_context(data)
+        prompt = self._build_prompt(query, context)
+
+        response = self.model.generate_content(prompt, stream=True)
+        for chunk in response:
+            if chunk.text:
+                yield chunk.text
+
+    def _build_prompt(self, query: str, context: str) -> str:
+        """Build the analysis prompt."""
+        return GEMINI_ANALYZE_PROMPT.format(query=query, context=context)
+
 
 class ResearchAnalyzer:
     """Main analyzer that tries multiple LLM providers."""
@@ -269,3 +415,61 @@ class ResearchAnalyzer:
         # Fallback to rule-based analysis
         logger.warning("No LLM available, using fallback analysis")
         return fallback_analysis(data, query)
+
+    async def analyze_async(self, data: Dict[str, List[Dict[str, Any]]], query: str) -> Dict[str, Any]:
+        """Analyze research data by racing all available providers.
+
+        Each available provider is started concurrently and the first
+        *successful* response wins; the remaining tasks are cancelled.
+        Latency collapses to the fastest healthy provider instead of
+        trying each one in sequence. The providers swallow their own
+        errors and return the rule-based fallback, so the racing path
+        treats a fallback-valued result as a failure and keeps waiting;
+        the fallback itself is only returned once every provider has
+        failed. The provider SDKs used here are synchronous, so each
+        attempt runs in a worker thread.
+        """
+        available = [
+            analyzer for analyzer, client in (
+                (self.groq, self.groq.client),
+                (self.gemini, self.gemini.model),
+                (self.huggingface, self.huggingface.client),
+            ) if client
+        ]
+
+        if not available:
+            logger.warning("No LLM available, using fallback analysis")
+            return fallback_analysis(data, query)
+
+        # fallback_analysis is deterministic, so a provider that caught
+        # an error internally is recognizable by its result comparing
+        # equal to this precomputed fallback
+        fallback = fallback_analysis(data, query)
+
+        def attempt(analyzer: Any) -> Dict[str, Any]:
+            result = analyzer.analyze(data, query)
+            if result == fallback:
+                raise RuntimeError(
+                    f"{type(analyzer).__name__} returned fallback analysis"
+                )
+            return result
+
+        pending = {
+            asyncio.create_task(asyncio.to_thread(attempt, analyzer))
+            for analyzer in available
+        }
+
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+        logger.warning("All LLM providers failed, using fallback analysis")
+        return fallback
@@ -3,15 +3,43 @@ Autonomous Research Agent Package
 An intelligent agent system that leverages open-source LLMs with self-improvement capabilities.
 """
 
+from typing import TYPE_CHECKING
+
 __version__ = "0.1.0"
 __author__ = "Autonomous Research Agent Team"
 
-from .models.model_manager import ModelManager
-from .agents.research_agent import ResearchAgent
-from .rag.knowledge_base import KnowledgeBase
+if TYPE_CHECKING:
+    from .models.model_manager import ModelManager
+    from .agents.research_agent import ResearchAgent
+    from .rag.knowledge_base import KnowledgeBase
 
 __all__ = [
     "ModelManager",
     "ResearchAgent",
     "KnowledgeBase",
 ]
+
+# Lazy attribute resolution (PEP 562): the heavy ML stacks behind these
+# classes (torch, transformers, sentence-transformers) are only imported
+# when a class is actually used, not at package-import time.
+_LAZY_IMPORTS = {
+    "ModelManager": ".models.model_manager",
+    "ResearchAgent": ".agents.research_agent",
+    "KnowledgeBase": ".rag.knowledge_base",
+}
+
+
+def __getattr__(name):
+    module_path = _LAZY_IMPORTS.get(name)
+    if module_path is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    import importlib
+    module = importlib.import_module(module_path, __name__)
+    value = getattr(module, name)
+    globals()[name] = value  # cache for subsequent lookups
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
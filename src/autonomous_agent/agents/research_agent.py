@@ -2,18 +2,74 @@
 Research Agent - The main autonomous research agent implementation.
 """
 
+import asyncio
+import atexit
+import copy
+import hashlib
 import logging
+import os
+import re
+import threading
+import time
+from collections import Counter, deque
 from typing import List, Dict, Any, Optional
 from datetime import datetime
-import json
 from pathlib import Path
 
+import orjson
+
 from ..config import get_config
 from ..models.model_manager import ModelManager
 from ..rag.knowledge_base import KnowledgeBase
+from ..rag.semantic_cache import SemanticCache
+from ..utils.tiered_cache import TieredCache
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of research results kept in the exact-match response cache.
+RESPONSE_CACHE_SIZE = 128
+
+# Feedback write-ahead log: buffered events are flushed to disk once
+# this many accumulate or this many seconds pass since the last flush.
+FEEDBACK_FLUSH_COUNT = 64
+FEEDBACK_FLUSH_INTERVAL = 5.0
+
+# Number of recent feedback entries kept in memory; the full history
+# lives in the on-disk feedback log.
+FEEDBACK_HISTORY_SIZE = 1024
+
+# Precompiled keyword matchers for query classification, checked in
+# priority order; each is a single C-level scan instead of a Python
+# loop over substring tests.
+_QUERY_TYPE_PATTERNS = (
+    ("code", re.compile(r"code|program|function|debug")),
+    ("reasoning", re.compile(r"explain|why|how|reason")),
+    ("fast", re.compile(r"quick|simple|brief")),
+    ("creative", re.compile(r"story|creative|imagine")),
+)
+
+# Numbered-list lines ("1. foo", "2) bar", indented or multi-digit) in
+# the decomposition output of multi_step_research.
+_SUBQ_RE = re.compile(r'^\s*(\d+)[.)]\s*(.+?)\s*$', re.MULTILINE)
+
+# Prompt templates, built once at import time. The fixed preamble must
+# stay byte-identical across calls: inference backends with automatic
+# prefix caching (vLLM, TGI) hash the prompt prefix to reuse KV cache,
+# so a stable preamble means prefill is skipped for those tokens.
+_PROMPT_WITH_CTX = """You are a helpful research assistant. Use the following context to answer the question accurately.
+
+{context}
+
+Question: {query}
+
+Answer: Provide a comprehensive and well-reasoned answer based on the context and your knowledge."""
+
+_PROMPT_NO_CTX = """You are a helpful research assistant. Answer the following question comprehensively.
+
+Question: {query}
+
+Answer:"""
+
 
 class ResearchAgent:
     """
@@ -21,6 +77,10 @@ class ResearchAgent:
     open-source models and self-improvement mechanisms.
     """
     
+    # Feedback directories already created this process; lets repeated
+    # agent construction (CLI commands, tests) skip the stat/mkdir pair.
+    _initialized_dirs: set = set()
+
     def __init__(
         self,
         model_manager: Optional[ModelManager] = None,
@@ -29,15 +89,73 @@ class ResearchAgent:
         """Initialize the research agent."""
         self.config = get_config()
         self.model_manager = model_manager or ModelManager()
-        self.knowledge_base = knowledge_base or KnowledgeBase() if self.config.agent.enable_rag else None
-        self.feedback_history: List[Dict[str, Any]] = []
-        
-        # Ensure feedback directory exists
+        # The knowledge base (and the embedding model it loads) is
+        # constructed lazily on first use; commands that never touch
+        # RAG skip the load entirely.
+        self._knowledge_base = knowledge_base if self.config.agent.enable_rag else None
+
+        # Recent feedback ring buffer plus running aggregates, so
+        # statistics stay O(1) and memory bounded as history grows.
+        self.feedback_history: "deque[Dict[str, Any]]" = deque(maxlen=FEEDBACK_HISTORY_SIZE)
+        self._rating_sum = 0
+        self._rating_counts: Counter = Counter()
+        self._feedback_count = 0
+
+        # Exact-match response cache: avoids re-running retrieval and
+        # generation when the same query (and flags) is seen again.
+        # Entries age out after the configured TTL and eviction weighs
+        # recency, frequency, and remaining lifetime together.
+        self._response_cache = TieredCache(
+            max_entries=RESPONSE_CACHE_SIZE,
+            ttl_seconds=self.config.agent.cache_ttl_seconds
+        )
+        self._cache_generation = 0
+
+        # Semantic cache for near-duplicate queries; created lazily on
+        # the first RAG query once the embedding dimension is known.
+        self._semantic_cache: Optional[SemanticCache] = None
+
+        # Cross-encoder reranker, loaded on first retrieval when
+        # agent.enable_rerank is set.
+        self._reranker = None
+
+        # Partial evaluation for fixed config: when RAG is disabled for
+        # this agent's lifetime, bind the slimmed research path that
+        # carries no retrieval, embedding, or semantic-cache branches.
+        if not self.config.agent.enable_rag:
+            self.research = self._research_no_rag
+        if not self.config.agent.enable_self_improvement:
+            self._analyze_failure = self._skip_failure_analysis
+
+        # Ensure feedback directory exists (once per process per path)
         feedback_path = Path(self.config.agent.feedback_storage_path)
-        feedback_path.mkdir(parents=True, exist_ok=True)
-        
+        if str(feedback_path) not in ResearchAgent._initialized_dirs:
+            feedback_path.mkdir(parents=True, exist_ok=True)
+            ResearchAgent._initialized_dirs.add(str(feedback_path))
+
+        # Buffered feedback log: events are appended to an in-memory
+        # buffer and flushed in batches to one newline-delimited JSON
+        # file per day, instead of one file write per event.
+        self._feedback_path = feedback_path
+        # Daily log file path, recomputed only when the day rolls over
+        self._feedback_day = ""
+        self._feedback_file: Optional[Path] = None
+        self._feedback_buffer: "deque[str]" = deque()
+        self._feedback_lock = threading.Lock()
+        self._last_feedback_flush = time.monotonic()
+        atexit.register(self._flush_feedback)
+
+
         logger.info("Research agent initialized")
-    
+
+    @property
+    def knowledge_base(self) -> Optional[KnowledgeBase]:
+        """Knowledge base instance, created on first access."""
+        if self._knowledge_base is None and self.config.agent.enable_rag:
+            self._knowledge_base = KnowledgeBase()
+        return self._knowledge_base
+
+
     def research(
         self,
         query: str,
@@ -56,20 +174,42 @@ class ResearchAgent:
             Dictionary containing the research results
         """
         logger.info(f"Starting research on: {query}")
-        
+
+        # Check the exact-match cache before doing any work
+        cache_key = self._response_cache_key(query, use_rag, model_name)
+        cached = self._response_cache.get(cache_key)
+        if cached is not None:
+            logger.info("Response cache hit, skipping retrieval and generation")
+            return copy.deepcopy(cached)
+
+        # For RAG queries, embed once and consult the semantic cache so
+        # near-duplicate queries skip retrieval and generation entirely.
+        # The probe goes through the knowledge base's cached encoder, so
+        # on a miss the retrieval below reuses this embedding instead of
+        # running a second forward pass.
+        query_embedding = None
+        if use_rag and self.knowledge_base is not None:
+            query_embedding = self.knowledge_base.embed_query(query)
+            semantic_hit = self._semantic_lookup(query_embedding)
+            if semantic_hit is not None:
+                logger.info("Semantic cache hit, skipping retrieval and generation")
+                result = copy.deepcopy(semantic_hit)
+                result["cache_hit"] = True
+                return result
+
         # Analyze query to select best model
         if model_name is None:
             task_type = self._analyze_query_type(query)
             model_name = self.model_manager.select_best_model(task_type)
-        
+
         logger.info(f"Selected model: {model_name}")
-        
+
         # Retrieve context if RAG is enabled
         context = ""
         retrieved_docs = []
         if use_rag and self.knowledge_base is not None:
             logger.info("Retrieving relevant context from knowledge base")
-            retrieved_docs = self.knowledge_base.search(query)
+            retrieved_docs = self._retrieve(query)
             context = self._format_context(retrieved_docs)
         
         # Construct prompt
@@ -88,26 +228,303 @@ class ResearchAgent:
             "retrieved_documents": len(retrieved_docs),
             "timestamp": datetime.now().isoformat()
         }
-        
+
+        # Store a copy so callers can mutate the returned dict freely,
+        # tagged with the documents it was derived from so targeted
+        # invalidation can drop exactly the affected answers.
+        self._response_cache.put(
+            cache_key,
+            copy.deepcopy(result),
+            doc_ids={doc['id'] for doc in retrieved_docs if doc.get('id')}
+        )
+
+        if query_embedding is not None:
+            self._semantic_store(query_embedding, result)
+
         logger.info("Research completed")
         return result
+
+    async def aresearch(
+        self,
+        query: str,
+        use_rag: bool = True,
+        model_name: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Async research that overlaps retrieval with model warmup.
+
+        RAG retrieval (embedding forward pass + vector search) and
+        loading/warming the selected model have no data dependency, so
+        they run concurrently in worker threads; only generation waits
+        on both. Results share the exact-match response cache with
+        research().
+
+        Args:
+            query: The research question or topic
+            use_rag: Whether to use RAG for context
+            model_name: Specific model to use (optional)
+
+        Returns:
+            Dictionary containing the research results
+        """
+        logger.info(f"Starting async research on: {query}")
+
+        cache_key = self._response_cache_key(query, use_rag, model_name)
+        cached = self._response_cache.get(cache_key)
+        if cached is not None:
+            logger.info("Response cache hit, skipping retrieval and generation")
+            return copy.deepcopy(cached)
+
+        if model_name is None:
+            task_type = self._analyze_query_type(query)
+            model_name = self.model_manager.select_best_model(task_type)
+
+        # Kick off retrieval and model warmup together
+        warmup = asyncio.create_task(
+            asyncio.to_thread(self.model_manager.ensure_loaded, model_name)
+        )
+        retrieved_docs = []
+        if use_rag and self.knowledge_base is not None:
+            retrieved_docs = await asyncio.to_thread(self._retrieve, query)
+        await warmup
+
+        context = self._format_context(retrieved_docs)
+        prompt = self._construct_prompt(query, context)
+
+        logger.info("Generating response...")
+        response = await asyncio.to_thread(
+            self.model_manager.generate, prompt, model_name=model_name
+        )
+
+        result = {
+            "query": query,
+            "response": response,
+            "model": model_name,
+            "context_used": bool(context),
+            "retrieved_documents": len(retrieved_docs),
+            "timestamp": datetime.now().isoformat()
+        }
+
+        self._response_cache.put(
+            cache_key,
+            copy.deepcopy(result),
+            doc_ids={doc['id'] for doc in retrieved_docs if doc.get('id')}
+        )
+
+        logger.info("Research completed")
+        return result
+
+    def stream_research(
+        self,
+        query: str,
+        use_rag: bool = True,
+        model_name: Optional[str] = None
+    ):
+        """
+        Stream a research response chunk by chunk.
+
+        Retrieval and prompt construction match research(), but the
+        generated text is yielded as the model produces it instead of
+        being buffered into a result dict, so callers see first tokens
+        at prefill latency.
+
+        Args:
+            query: The research question or topic
+            use_rag: Whether to use RAG for context
+            model_name: Specific model to use (optional)
+
+        Yields:
+            Chunks of generated text
+        """
+        logger.info(f"Starting streaming research on: {query}")
+
+        if model_name is None:
+            task_type = self._analyze_query_type(query)
+            model_name = self.model_manager.select_best_model(task_type)
+
+        context = ""
+        if use_rag and self.knowledge_base is not None:
+            context = self._format_context(self._retrieve(query))
+
+        prompt = self._construct_prompt(query, context)
+        yield from self.model_manager.stream(prompt, model_name=model_name)
+
+    def _research_no_rag(
+        self,
+        query: str,
+        use_rag: bool = True,
+        model_name: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Specialized research path bound when RAG is disabled.
+
+        Same signature and result shape as research(), minus the
+        retrieval, query-embedding, and semantic-cache work that can
+        never apply while the knowledge base is off.
+        """
+        logger.info(f"Starting research on: {query}")
+
+        cache_key = self._response_cache_key(query, use_rag, model_name)
+        cached = self._response_cache.get(cache_key)
+        if cached is not None:
+            logger.info("Response cache hit, skipping generation")
+            return copy.deepcopy(cached)
+
+        if model_name is None:
+            task_type = self._analyze_query_type(query)
+            model_name = self.model_manager.select_best_model(task_type)
+
+        logger.info(f"Selected model: {model_name}")
+
+        prompt = self._construct_prompt(query)
+
+        logger.info("Generating response...")
+        response = self.model_manager.generate(prompt, model_name=model_name)
+
+        result = {
+            "query": query,
+            "response": response,
+            "model": model_name,
+            "context_used": False,
+            "retrieved_documents": 0,
+            "timestamp": datetime.now().isoformat()
+        }
+
+        self._response_cache.put(cache_key, copy.deepcopy(result))
+
+        logger.info("Research completed")
+        return result
+
+    def _skip_failure_analysis(self, feedback: Dict[str, Any]) -> None:
+        """No-op failure hook bound when self-improvement is disabled."""
+
+    def _semantic_lookup(self, query_embedding: Any) -> Optional[Dict[str, Any]]:
+        """Look up a near-duplicate query in the semantic cache."""
+        if self._semantic_cache is None:
+            return None
+        return self._semantic_cache.get(query_embedding)
+
+    def _semantic_store(self, query_embedding: Any, result: Dict[str, Any]) -> None:
+        """Store a research result in the semantic cache."""
+        if self._semantic_cache is None:
+            self._semantic_cache = SemanticCache(
+                dimension=len(query_embedding),
+                threshold=self.config.agent.cache_threshold,
+                ttl_seconds=self.config.agent.cache_ttl_seconds
+            )
+        self._semantic_cache.add(query_embedding, copy.deepcopy(result))
+
+    def _response_cache_key(
+        self,
+        query: str,
+        use_rag: bool,
+        model_name: Optional[str]
+    ) -> str:
+        """Build the cache key for a research call.
+
+        The key embeds a generation counter that is bumped whenever the
+        knowledge base changes, so stale answers are never served.
+        """
+        digest = hashlib.blake2b(query.encode('utf-8'), digest_size=16).hexdigest()
+        return f"{digest}:{use_rag}:{model_name}:{self._cache_generation}"
+
+    def _invalidate_response_cache(self) -> None:
+        """Invalidate cached responses after a knowledge base update."""
+        self._cache_generation += 1
+        self._response_cache.clear()
+        if self._semantic_cache is not None:
+            self._semantic_cache.clear(reset_stats=False)
+
+    def _analyze_query_type(self, query: str, query_lower: Optional[str] = None) -> str:
+        """Analyze the query to determine its type.
+
+        Callers that already hold a lowercased copy of the query can
+        pass it via query_lower to skip the O(N) re-lowering.
+        """
+        if query_lower is None:
+            query_lower = query.lower()
+
+        # Simple heuristic-based classification; first matching
+        # category in _QUERY_TYPE_PATTERNS wins
+        for task_type, pattern in _QUERY_TYPE_PATTERNS:
+            if pattern.search(query_lower):
+                return task_type
+        return "general"
     
-    def _analyze_query_type(self, query: str) -> str:
-        """Analyze the query to determine its type."""
-        query_lower = query.lower()
-        
-        # Simple heuristic-based classification
-        if any(keyword in query_lower for keyword in ['code', 'program', 'function', 'debug']):
-            return "code"
-        elif any(keyword in query_lower for keyword in ['explain', 'why', 'how', 'reason']):
-            return "reasoning"
-        elif any(keyword in query_lower for keyword in ['quick', 'simple', 'brief']):
-            return "fast"
-        elif any(keyword in query_lower for keyword in ['story', 'creative', 'imagine']):
-            return "creative"
-        else:
-            return "general"
-    
+    def _get_reranker(self):
+        """Get the cross-encoder reranker, loading it on first use."""
+        if self._reranker is None:
+            from sentence_transformers import CrossEncoder
+
+            logger.info(f"Loading reranker: {self.config.rag.rerank_model}")
+            self._reranker = CrossEncoder(self.config.rag.rerank_model)
+        return self._reranker
+
+    def _retrieve(self, query: str) -> List[Dict[str, Any]]:
+        """Retrieve context documents for a query.
+
+        When reranking is enabled, a wider candidate set is pulled from
+        the vector store, rescored with the cross-encoder, and trimmed
+        to the top rerank_keep documents; the bi-encoder recall stage is
+        cheap, so the precision of the final, smaller prompt improves
+        while prefill cost drops.
+        """
+        if not self.config.agent.enable_rerank:
+            return self.knowledge_base.search(query)
+
+        candidates = self.knowledge_base.search(
+            query, top_k=self.config.rag.rerank_candidates
+        )
+        return self._rerank(query, candidates)
+
+    def _rerank(
+        self,
+        query: str,
+        candidates: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Rescore candidates with the cross-encoder and keep the best."""
+        if len(candidates) <= self.config.rag.rerank_keep:
+            return candidates
+
+        scores = self._get_reranker().predict(
+            [(query, doc['content']) for doc in candidates]
+        )
+        ranked = sorted(
+            zip(scores, candidates), key=lambda pair: pair[0], reverse=True
+        )
+        return [doc for _, doc in ranked[:self.config.rag.rerank_keep]]
+
+    def _retrieve_batch(self, queries: List[str]) -> List[List[Dict[str, Any]]]:
+        """Retrieve (and optionally rerank) documents for several queries.
+
+        All (query, candidate) pairs are scored in a single cross-encoder
+        call rather than one predict() per query.
+        """
+        if not self.config.agent.enable_rerank:
+            return self.knowledge_base.search_batch(queries)
+
+        docs_per_query = self.knowledge_base.search_batch(
+            queries, top_k=self.config.rag.rerank_candidates
+        )
+        pairs = [
+            (query, doc['content'])
+            for query, docs in zip(queries, docs_per_query)
+            for doc in docs
+        ]
+        if not pairs:
+            return docs_per_query
+
+        scores = iter(self._get_reranker().predict(pairs))
+        keep = self.config.rag.rerank_keep
+        reranked = []
+        for docs in docs_per_query:
+            ranked = sorted(
+                ((next(scores), doc) for doc in docs),
+                key=lambda pair: pair[0],
+                reverse=True
+            )
+            reranked.append([doc for _, doc in ranked[:keep]])
+        return reranked
+
     def _format_context(self, documents: List[Dict[str, Any]]) -> str:
         """Format retrieved documents into context string."""
         if not documents:
@@ -121,21 +538,10 @@ class ResearchAgent:
         return "\n".join(context_parts)
     
     def _construct_prompt(self, query: str, context: str = "") -> str:
-        """Construct the prompt for the model."""
+        """Construct the prompt for the model from the fixed templates."""
         if context:
-            return f"""You are a helpful research assistant. Use the following context to answer the question accurately.
-
-{context}
-
-Question: {query}
-
-Answer: Provide a comprehensive and well-reasoned answer based on the context and your knowledge."""
-        else:
-            return f"""You are a helpful research assistant. Answer the following question comprehensively.
-
-Question: {query}
-
-Answer:"""
+            return _PROMPT_WITH_CTX.format(context=context, query=query)
+        return _PROMPT_NO_CTX.format(query=query)
     
     def add_to_knowledge_base(
         self,
@@ -148,8 +554,36 @@ Answer:"""
             return ""
         
         logger.info("Adding content to knowledge base")
+        self._invalidate_response_cache()
         return self.knowledge_base.add_document(content, metadata)
-    
+
+    def add_documents(
+        self,
+        contents: List[str],
+        metadatas: Optional[List[Dict[str, Any]]] = None
+    ) -> List[str]:
+        """Add multiple documents to the knowledge base in one batch.
+
+        Embeds all contents in a single batched call instead of one
+        model invocation per document, and invalidates the response
+        cache once rather than per document.
+
+        Args:
+            contents: Document texts to add
+            metadatas: Optional per-document metadata, aligned with contents
+
+        Returns:
+            List of document IDs
+        """
+        if self.knowledge_base is None:
+            logger.warning("Knowledge base is not enabled")
+            return []
+
+        logger.info(f"Adding {len(contents)} documents to knowledge base")
+        self._invalidate_response_cache()
+        return self.knowledge_base.add_documents(contents, metadatas)
+
+
     def add_feedback(
         self,
         query: str,
@@ -175,7 +609,10 @@ Answer:"""
         }
         
         self.feedback_history.append(feedback)
-        
+        self._rating_sum += rating
+        self._rating_counts[rating] += 1
+        self._feedback_count += 1
+
         # Save feedback to disk
         self._save_feedback(feedback)
         
@@ -187,15 +624,39 @@ Answer:"""
         logger.info(f"Feedback recorded: {rating}/5")
     
     def _save_feedback(self, feedback: Dict[str, Any]) -> None:
-        """Save feedback to persistent storage."""
-        feedback_path = Path(self.config.agent.feedback_storage_path)
-        
-        # Use timestamp for unique filename
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-        filename = feedback_path / f"feedback_{timestamp}.json"
-        
-        with open(filename, 'w') as f:
-            json.dump(feedback, f, indent=2)
+        """Buffer feedback for batched persistence."""
+        with self._feedback_lock:
+            self._feedback_buffer.append(orjson.dumps(feedback).decode() + "\n")
+            flush_due = (
+                len(self._feedback_buffer) >= FEEDBACK_FLUSH_COUNT
+                or time.monotonic() - self._last_feedback_flush >= FEEDBACK_FLUSH_INTERVAL
+            )
+        if flush_due:
+            self._flush_feedback()
+
+    def _flush_feedback(self) -> None:
+        """Write buffered feedback to the daily append-only log."""
+        with self._feedback_lock:
+            if not self._feedback_buffer:
+                return
+            lines = list(self._feedback_buffer)
+            self._feedback_buffer.clear()
+            self._last_feedback_flush = time.monotonic()
+
+        day = time.strftime("%Y%m%d")
+        if day != self._feedback_day:
+            self._feedback_day = day
+            self._feedback_file = self._feedback_path / f"feedback_{day}.jsonl"
+        try:
+            with open(self._feedback_file, 'a') as f:
+                f.writelines(lines)
+                if self.config.agent.feedback_fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+        except OSError as e:
+            # Feedback persistence is best-effort; don't fail the caller
+            # (or interpreter shutdown) over a log write.
+            logger.error(f"Failed to flush feedback log: {e}")
     
     def _analyze_failure(self, feedback: Dict[str, Any]) -> None:
         """Analyze failed responses to identify improvement areas."""
@@ -218,21 +679,20 @@ Answer:"""
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get agent statistics."""
-        if not self.feedback_history:
+        if not self._feedback_count:
             return {
                 "total_interactions": 0,
                 "average_rating": 0,
                 "knowledge_base_documents": self._get_kb_count(),
                 "loaded_models": self.model_manager.list_loaded_models()
             }
-        
-        ratings = [f["rating"] for f in self.feedback_history]
-        
+
+        # Aggregates are maintained incrementally in add_feedback
         return {
-            "total_interactions": len(self.feedback_history),
-            "average_rating": sum(ratings) / len(ratings),
+            "total_interactions": self._feedback_count,
+            "average_rating": self._rating_sum / self._feedback_count,
             "rating_distribution": {
-                str(i): ratings.count(i) for i in range(1, 6)
+                str(i): self._rating_counts.get(i, 0) for i in range(1, 6)
             },
             "knowledge_base_documents": self._get_kb_count(),
             "loaded_models": self.model_manager.list_loaded_models()
@@ -240,14 +700,24 @@ Answer:"""
     
     def _get_kb_count(self) -> int:
         """Get count of documents in knowledge base."""
-        if self.knowledge_base is None:
+        # Check the backing attribute directly so a stats call never
+        # forces the lazy knowledge base construction.
+        if self._knowledge_base is None:
             return 0
-        
+
+        vector_store = self._knowledge_base.vector_store
+        if vector_store is None:
+            # Knowledge base exists but hasn't lazily initialized yet,
+            # so nothing has been stored
+            return 0
+
         if self.config.rag.vector_db_type == "chromadb":
-            return self.knowledge_base.vector_store.count()
+            return vector_store.count()
         elif self.config.rag.vector_db_type == "faiss":
-            return len(self.knowledge_base.documents)
-        
+            # FAISS tracks its own row count; don't touch the parallel
+            # document list for a count.
+            return vector_store.ntotal
+
         return 0
     
     def multi_step_research(
@@ -276,30 +746,37 @@ Provide exactly {max_steps} sub-questions, numbered 1-{max_steps}:"""
         
         decomposition = self.model_manager.generate(decomposition_prompt)
         
-        # Extract sub-questions (simple parsing)
-        sub_questions = []
-        for line in decomposition.split('\n'):
-            line = line.strip()
-            if line and any(line.startswith(f"{i}.") or line.startswith(f"{i})") for i in range(1, max_steps + 1)):
-                # Remove numbering
-                question = line.split('.', 1)[-1].split(')', 1)[-1].strip()
-                if question:
-                    sub_questions.append(question)
-        
-        # Limit to max_steps
-        sub_questions = sub_questions[:max_steps]
+        # Extract sub-questions: one regex pass over the whole output,
+        # limited to the expected numbering and max_steps
+        sub_questions = [
+            match.group(2)
+            for match in _SUBQ_RE.finditer(decomposition)
+            if 1 <= int(match.group(1)) <= max_steps
+        ][:max_steps]
         
         logger.info(f"Decomposed into {len(sub_questions)} sub-questions")
         
-        # Step 2: Research each sub-question
+        # Step 2: Research all sub-questions in one batched generation
+        # call. Contexts are retrieved up front, then the prompts are
+        # submitted together so the backend can serve them concurrently
+        # instead of paying full per-call latency max_steps times.
         sub_results = []
-        for i, sub_q in enumerate(sub_questions, 1):
-            logger.info(f"Researching sub-question {i}/{len(sub_questions)}")
-            result = self.research(sub_q)
-            sub_results.append({
-                "question": sub_q,
-                "answer": result["response"]
-            })
+        if sub_questions:
+            # One batched embedding + vector search for all sub-questions
+            contexts = [""] * len(sub_questions)
+            if self.knowledge_base is not None:
+                docs_per_question = self._retrieve_batch(sub_questions)
+                contexts = [self._format_context(docs) for docs in docs_per_question]
+
+            prompts = [
+                self._construct_prompt(sub_q, context)
+                for sub_q, context in zip(sub_questions, contexts)
+            ]
+            answers = self.model_manager.generate_batch(prompts)
+            sub_results = [
+                {"question": sub_q, "answer": answer}
+                for sub_q, answer in zip(sub_questions, answers)
+            ]
         
         # Step 3: Synthesize final answer
         synthesis_prompt = f"""Based on the following research, provide a comprehensive answer to the original question.
@@ -2,8 +2,11 @@
 FastAPI-based REST API for the autonomous research agent.
 """
 
+import asyncio
+import json
 from typing import Optional, List, Dict, Any
 from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
 import logging
 from datetime import datetime
@@ -19,7 +22,8 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="Autonomous Research Agent API",
     description="API for interacting with an autonomous research agent powered by open-source LLMs",
-    version="0.1.0"
+    version="0.1.0",
+    default_response_class=ORJSONResponse
 )
 
 # Global agent instance
@@ -123,7 +127,10 @@ async def research(request: ResearchRequest):
     """
     try:
         agent = get_agent()
-        result = agent.research(
+        # Offload the blocking LLM call so the event loop keeps
+        # servicing other connections while generation runs
+        result = await asyncio.to_thread(
+            agent.research,
             query=request.query,
             use_rag=request.use_rag,
             model_name=request.model_name
@@ -144,6 +151,41 @@ async def research(request: ResearchRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/research/stream")
+async def research_stream(request: ResearchRequest):
+    """
+    Stream research output as Server-Sent Events.
+
+    Tokens are forwarded to the client as the model produces them, so
+    time-to-first-token is prefill latency rather than the full decode.
+
+    Args:
+        request: Research request containing query and options
+
+    Returns:
+        text/event-stream of generated text chunks
+    """
+    agent = get_agent()
+
+    def event_stream():
+        try:
+            chunks = agent.stream_research(
+                query=request.query,
+                use_rag=request.use_rag,
+                model_name=request.model_name
+            )
+            for chunk in chunks:
+                yield f"data: {json.dumps({'response': chunk})}\n\n"
+            yield "data: [DONE]\n\n"
+        except Exception as e:
+            logger.error(f"Error in streaming research: {e}")
+            yield f"data: {json.dumps({'error': str(e)})}\n\n"
+
+    # Starlette iterates sync generators in its thread pool, keeping
+    # the event loop free while tokens arrive
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
 @app.post("/research/multi-step", response_model=MultiStepResearchResponse)
 async def multi_step_research(request: MultiStepResearchRequest):
     """
@@ -157,7 +199,8 @@ async def multi_step_research(request: MultiStepResearchRequest):
     """
     try:
         agent = get_agent()
-        result = agent.multi_step_research(
+        result = await asyncio.to_thread(
+            agent.multi_step_research,
             query=request.query,
             max_steps=request.max_steps
         )
@@ -181,7 +224,8 @@ async def add_feedback(request: FeedbackRequest):
     """
     try:
         agent = get_agent()
-        agent.add_feedback(
+        await asyncio.to_thread(
+            agent.add_feedback,
             query=request.query,
             response=request.response,
             rating=request.rating,
@@ -207,7 +251,8 @@ async def add_knowledge(request: KnowledgeRequest):
     """
     try:
         agent = get_agent()
-        doc_id = agent.add_to_knowledge_base(
+        doc_id = await asyncio.to_thread(
+            agent.add_to_knowledge_base,
             content=request.content,
             metadata=request.metadata
         )
@@ -231,7 +276,7 @@ async def get_statistics():
     """
     try:
         agent = get_agent()
-        stats = agent.get_statistics()
+        stats = await asyncio.to_thread(agent.get_statistics)
         return StatisticsResponse(**stats)
     
     except Exception as e:
@@ -272,7 +317,7 @@ async def get_configuration():
     """
     try:
         config = get_config()
-        return config.model_dump()
+        return config.cached_dump()
     
     except Exception as e:
         logger.error(f"Error getting config: {e}")
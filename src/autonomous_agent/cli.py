@@ -5,8 +5,9 @@ Command-line interface for the autonomous research agent.
 
 import argparse
 import sys
-import json
 import logging
+
+import orjson
 from pathlib import Path
 
 from autonomous_agent import ResearchAgent
@@ -52,12 +53,12 @@ def cmd_research(args):
     
     # Output result
     if args.output:
-        with open(args.output, 'w') as f:
-            json.dump(output, f, indent=2)
+        with open(args.output, 'wb') as f:
+            f.write(orjson.dumps(output, option=orjson.OPT_INDENT_2))
         print(f"Results saved to {args.output}")
     else:
         if args.json:
-            print(json.dumps(output, indent=2))
+            print(orjson.dumps(output, option=orjson.OPT_INDENT_2).decode())
         else:
             print("\n" + "=" * 60)
             print("QUERY:", output.get("query"))
@@ -100,7 +101,7 @@ def cmd_add_knowledge(args):
     # Add to knowledge base
     metadata = {"source": args.file}
     if args.metadata:
-        metadata.update(json.loads(args.metadata))
+        metadata.update(orjson.loads(args.metadata))
     
     for chunk in chunks:
         agent.add_to_knowledge_base(chunk, metadata)
@@ -152,7 +153,7 @@ def cmd_config(args):
         else:
             config = Config.load_default()
         
-        print(json.dumps(config.model_dump(), indent=2))
+        print(orjson.dumps(config.model_dump(), option=orjson.OPT_INDENT_2).decode())
 
 
 def main():
@@ -5,6 +5,8 @@ Configuration management for the autonomous research agent.
 import os
 from typing import Dict, Any, List
 from pathlib import Path
+
+import orjson
 from pydantic import BaseModel, Field
 
 
@@ -26,20 +28,32 @@ class RAGConfig(BaseModel):
     vector_db_type: str = "chromadb"  # 'chromadb', 'faiss'
     vector_db_path: str = "./data/vector_db"
     embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2"
+    embedding_dtype: str = "float16"  # 'float32', 'float16', 'int8'
+    faiss_index_type: str = "hnsw"  # 'hnsw', 'flat'
+    hnsw_m: int = 32
+    hnsw_ef_construction: int = 200
+    hnsw_ef_search: int = 64
     chunk_size: int = 512
     chunk_overlap: int = 50
     top_k_results: int = 5
     similarity_threshold: float = 0.7
+    rerank_model: str = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+    rerank_candidates: int = 20
+    rerank_keep: int = 3
 
 
 class AgentConfig(BaseModel):
     """Configuration for the research agent."""
     default_model: str = "llama"
     enable_rag: bool = True
+    enable_rerank: bool = False
     enable_self_improvement: bool = True
     max_iterations: int = 10
     feedback_storage_path: str = "./data/feedback"
     log_level: str = "INFO"
+    cache_threshold: float = 0.95
+    cache_ttl_seconds: float = 3600.0
+    feedback_fsync: bool = False
 
 
 class Config(BaseModel):
@@ -50,8 +64,17 @@ class Config(BaseModel):
     
     @classmethod
     def load_default(cls) -> "Config":
-        """Load default configuration with common open-source models."""
-        return cls(
+        """Load default configuration with common open-source models.
+
+        The default is built once per process and deep-copied on each
+        call, so repeated loads skip re-validation while callers remain
+        free to mutate the returned config.
+        """
+        global _default_config
+        if _default_config is not None:
+            return _default_config.model_copy(deep=True)
+
+        _default_config = cls(
             models={
                 "llama": ModelConfig(
                     name="llama-3.1-8b",
@@ -78,22 +101,39 @@ class Config(BaseModel):
             rag=RAGConfig(),
             agent=AgentConfig()
         )
-    
+        return _default_config.model_copy(deep=True)
+
+    def cached_dump(self) -> Dict[str, Any]:
+        """Return a memoized model_dump() of this config.
+
+        Configs are effectively immutable once installed via
+        set_config(), which resets the memo; callers that mutate a
+        config in place should re-install it to refresh the dump.
+        """
+        dump = getattr(self, "_dump_cache", None)
+        if dump is None:
+            dump = self.model_dump()
+            object.__setattr__(self, "_dump_cache", dump)
+        return dump
+
     def save(self, path: str) -> None:
         """Save configuration to JSON file."""
-        with open(path, 'w') as f:
-            f.write(self.model_dump_json(indent=2))
-    
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(self.model_dump(), option=orjson.OPT_INDENT_2))
+
     @classmethod
     def load(cls, path: str) -> "Config":
         """Load configuration from JSON file."""
-        with open(path, 'r') as f:
-            return cls.model_validate_json(f.read())
+        with open(path, 'rb') as f:
+            return cls.model_validate(orjson.loads(f.read()))
 
 
 # Global config instance
 _config: Config = None
 
+# Memoized template for Config.load_default()
+_default_config: Config = None
+
 
 def get_config() -> Config:
     """Get the global configuration instance."""
@@ -106,4 +146,5 @@ def get_config() -> Config:
 def set_config(config: Config) -> None:
     """Set the global configuration instance."""
     global _config
+    object.__setattr__(config, "_dump_cache", None)
     _config = config
@@ -0,0 +1,47 @@
+"""Numba kernels for hot-path evaluation metrics.
+
+Importing this module requires numba; metrics.py treats an ImportError
+as "kernels unavailable" and keeps the pure-Python paths.
+"""
+
+from numba import njit
+
+
+@njit(cache=True)
+def coherence_stats(buf):  # pragma: no cover
+    """Walk a utf-8/ascii byte buffer once for coherence statistics.
+
+    Returns (has_upper, sentence_count, word_total) where sentences are
+    '.'-delimited segments containing at least one token and tokens are
+    runs of non-whitespace, non-'.' bytes — matching what
+    text.split('.') followed by str.split() produces for ASCII text.
+    """
+    has_upper = 0
+    sentence_tokens = 0
+    sentence_count = 0
+    word_total = 0
+    in_token = False
+    for i in range(buf.shape[0]):
+        b = buf[i]
+        if 65 <= b <= 90:
+            has_upper = 1
+        if b == 46:  # '.'
+            if in_token:
+                sentence_tokens += 1
+                in_token = False
+            if sentence_tokens:
+                sentence_count += 1
+                word_total += sentence_tokens
+                sentence_tokens = 0
+        elif b == 32 or 9 <= b <= 13:  # ASCII whitespace
+            if in_token:
+                sentence_tokens += 1
+                in_token = False
+        else:
+            in_token = True
+    if in_token:
+        sentence_tokens += 1
+    if sentence_tokens:
+        sentence_count += 1
+        word_total += sentence_tokens
+    return has_upper, sentence_count, word_total
@@ -3,9 +3,16 @@ Model management for autonomous research agent.
 Handles loading, managing, and interfacing with different LLM backends.
 """
 
+import json
 import logging
 import os
+import queue
+import threading
+import time
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from typing import Dict, List, Optional, Any
 import requests
 
@@ -14,6 +21,71 @@ from ..config import ModelConfig, get_config
 logger = logging.getLogger(__name__)
 
 
+class _RequestBatcher:
+    """Coalesces concurrent generate() calls into dispatched batches.
+
+    Callers enqueue (prompt, model_name, kwargs) tuples and block on a
+    Future; a background dispatcher drains up to ``max_batch_size``
+    requests (waiting at most ``max_latency_ms`` for stragglers) and
+    issues them together, amortizing per-call round-trip overhead.
+    """
+
+    def __init__(self, manager: "ModelManager", max_latency_ms: int, max_batch_size: int):
+        self._manager = manager
+        self._max_latency = max_latency_ms / 1000.0
+        self._max_batch_size = max_batch_size
+        self._queue: "queue.Queue" = queue.Queue()
+        self._shutdown = threading.Event()
+        self._dispatcher = threading.Thread(target=self._run, daemon=True)
+        self._dispatcher.start()
+
+    def submit(self, prompt: str, model_name: Optional[str], kwargs: Dict[str, Any]) -> Future:
+        """Enqueue a generation request and return its Future."""
+        future: Future = Future()
+        self._queue.put((prompt, model_name, kwargs, future))
+        return future
+
+    def _run(self) -> None:
+        while not self._shutdown.is_set():
+            try:
+                first = self._queue.get(timeout=0.05)
+            except queue.Empty:
+                continue
+
+            batch = [first]
+            deadline = time.monotonic() + self._max_latency
+            while len(batch) < self._max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            self._dispatch(batch)
+
+    def _dispatch(self, batch: List[Any]) -> None:
+        """Issue a drained batch concurrently and scatter results."""
+        logger.info(f"Dispatching generation batch of {len(batch)}")
+        with ThreadPoolExecutor(max_workers=len(batch)) as executor:
+            for prompt, model_name, kwargs, future in batch:
+                executor.submit(self._fulfill, prompt, model_name, kwargs, future)
+
+    def _fulfill(self, prompt: str, model_name: Optional[str], kwargs: Dict[str, Any], future: Future) -> None:
+        try:
+            future.set_result(self._manager._generate_direct(prompt, model_name, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+
+    def shutdown(self) -> None:
+        """Stop the dispatcher once pending requests are drained."""
+        while not self._queue.empty():
+            time.sleep(0.01)
+        self._shutdown.set()
+        self._dispatcher.join()
+
+
 class BaseModel(ABC):
     """Base class for all model implementations."""
     
@@ -54,6 +126,35 @@ class BaseModel(ABC):
         """
         pass
     
+    def generate_stream(
+        self,
+        prompt: str,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        **kwargs
+    ):
+        """
+        Stream generated text from the model.
+
+        Backends without native streaming fall back to yielding the
+        full completion as a single chunk.
+
+        Args:
+            prompt: Input prompt
+            max_tokens: Maximum tokens to generate
+            temperature: Sampling temperature
+            **kwargs: Additional model-specific parameters
+
+        Yields:
+            Chunks of generated text
+        """
+        yield self.generate(
+            prompt,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            **kwargs
+        )
+
     def unload(self) -> None:
         """Unload the model from memory."""
         self.loaded = False
@@ -66,6 +167,17 @@ class OllamaModel(BaseModel):
         """Initialize Ollama model."""
         super().__init__(config)
         self.base_url = os.getenv("OLLAMA_HOST", "http://localhost:11434")
+
+        # Pooled keep-alive session: chained generations reuse one TCP
+        # connection instead of paying a handshake per request, with a
+        # couple of retries on transient connection failures.
+        self._session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=8,
+            pool_maxsize=16,
+            max_retries=requests.adapters.Retry(total=2, backoff_factor=0.2)
+        )
+        self._session.mount("http://", adapter)
     
     def load(self) -> None:
         """Load is a no-op for Ollama (models are loaded on-demand)."""
@@ -81,41 +193,79 @@ class OllamaModel(BaseModel):
     ) -> str:
         """
         Generate text using Ollama API.
-        
+
+        Consumes the streaming endpoint and joins the chunks: the
+        server starts sending tokens as they are produced instead of
+        buffering the whole completion, so the connection carries data
+        immediately and callers that wrap this in a generator (or use
+        generate_stream directly) can stop a bad generation early.
+
         Args:
             prompt: Input prompt
             max_tokens: Maximum tokens to generate
             temperature: Sampling temperature
             **kwargs: Additional parameters
-            
+
         Returns:
             Generated text
         """
+        return "".join(self.generate_stream(
+            prompt,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            **kwargs
+        ))
+
+    def generate_stream(
+        self,
+        prompt: str,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        **kwargs
+    ):
+        """
+        Stream generated text from the Ollama API token by token.
+
+        Args:
+            prompt: Input prompt
+            max_tokens: Maximum tokens to generate
+            temperature: Sampling temperature
+            **kwargs: Additional parameters
+
+        Yields:
+            Chunks of generated text as Ollama produces them
+        """
         endpoint = f"{self.base_url}/api/generate"
-        
-        # Prepare request payload
+
         payload = {
             "model": self.config.model_path,
             "prompt": prompt,
-            "stream": False,
+            "stream": True,
             "options": {
                 "num_predict": max_tokens or self.config.max_tokens,
                 "temperature": temperature or self.config.temperature,
                 "top_p": self.config.top_p,
             }
         }
-        
+
         try:
-            logger.info(f"Generating with Ollama model: {self.config.name}")
-            response = requests.post(endpoint, json=payload, timeout=120)
-            response.raise_for_status()
-            
-            result = response.json()
-            return result.get("response", "")
-        
+            logger.info(f"Streaming with Ollama model: {self.config.name}")
+            with self._session.post(endpoint, json=payload, timeout=120, stream=True) as response:
+                response.raise_for_status()
+
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    data = json.loads(line)
+                    chunk = data.get("response", "")
+                    if chunk:
+                        yield chunk
+                    if data.get("done"):
+                        break
+
         except requests.exceptions.RequestException as e:
             logger.error(f"Ollama API error: {e}")
-            raise Exception(f"Failed to generate response from Ollama: {e}")
+            raise Exception(f"Failed to stream response from Ollama: {e}")
 
 
 class LocalTransformersModel(BaseModel):
@@ -165,8 +315,24 @@ class LocalTransformersModel(BaseModel):
                 load_kwargs["torch_dtype"] = torch.float16
                 load_kwargs["device_map"] = device
             
-            self.model = AutoModelForCausalLM.from_pretrained(**load_kwargs)
-            
+            # Prefer FlashAttention-2 kernels for attention (large cut
+            # in attention memory traffic); fall back to PyTorch SDPA
+            # when flash-attn isn't installed or supported
+            try:
+                self.model = AutoModelForCausalLM.from_pretrained(
+                    attn_implementation="flash_attention_2", **load_kwargs
+                )
+            except (ImportError, ValueError):
+                self.model = AutoModelForCausalLM.from_pretrained(
+                    attn_implementation="sdpa", **load_kwargs
+                )
+
+            # Compile the forward pass to trim per-step dispatch
+            # overhead; the first generation pays the compile cost
+            self.model = torch.compile(
+                self.model, mode="reduce-overhead", fullgraph=False
+            )
+
             self.loaded = True
             logger.info(f"Model {self.config.name} loaded successfully on {device}")
         
@@ -206,16 +372,26 @@ class LocalTransformersModel(BaseModel):
             if hasattr(self.model, "device"):
                 inputs = {k: v.to(self.model.device) for k, v in inputs.items()}
             
-            # Generate
-            outputs = self.model.generate(
-                **inputs,
-                max_new_tokens=max_tokens or self.config.max_tokens,
-                temperature=temperature or self.config.temperature,
-                top_p=self.config.top_p,
-                do_sample=True,
-                pad_token_id=self.tokenizer.eos_token_id,
-                **kwargs
-            )
+            # Generate with the KV cache enabled; sampling only when
+            # the temperature calls for it (greedy decode at 0)
+            if temperature is None:
+                temperature = self.config.temperature
+            gen_kwargs = {
+                "max_new_tokens": max_tokens or self.config.max_tokens,
+                "use_cache": True,
+                "pad_token_id": self.tokenizer.eos_token_id,
+            }
+            if temperature > 0:
+                gen_kwargs.update(
+                    do_sample=True,
+                    temperature=temperature,
+                    top_p=self.config.top_p,
+                )
+            else:
+                gen_kwargs["do_sample"] = False
+            gen_kwargs.update(kwargs)
+
+            outputs = self.model.generate(**inputs, **gen_kwargs)
             
             # Decode
             generated_text = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
@@ -256,18 +432,35 @@ class ModelManager:
     """
     Manages multiple language models and handles model selection and generation.
     """
-    
-    def __init__(self, config: Optional[Any] = None):
+
+    # Heuristic task-type -> model mapping; the model set is fixed, so
+    # this is resolved once per task via the selection cache.
+    _TASK_TO_MODEL = {
+        "code": "llama",
+        "reasoning": "llama",
+        "general": "mistral",
+        "fast": "phi",
+        "creative": "mistral",
+    }
+
+    def __init__(self, config: Optional[Any] = None, max_resident: int = 2):
         """
         Initialize the model manager.
-        
+
         Args:
             config: Optional configuration object
+            max_resident: Maximum local transformers models kept in
+                memory at once; the least recently used is unloaded to
+                make room (Ollama models are server-side and uncapped)
         """
         self.config = config or get_config()
         self.configs: Dict[str, ModelConfig] = self.config.models.copy()
-        self.models: Dict[str, BaseModel] = {}
-        
+        self.max_resident = max_resident
+        # Ordered by recency of use so eviction can drop the LRU model
+        self.models: "OrderedDict[str, BaseModel]" = OrderedDict()
+        self._batcher: Optional[_RequestBatcher] = None
+        self._selection_cache: Dict[str, str] = {}
+
         logger.info(f"ModelManager initialized with {len(self.configs)} model configs")
     
     def register_model(self, name: str, config: ModelConfig) -> None:
@@ -279,6 +472,7 @@ class ModelManager:
             config: Model configuration
         """
         self.configs[name] = config
+        self._selection_cache.clear()
         logger.info(f"Registered model: {name}")
     
     def load_model(self, name: str) -> None:
@@ -293,14 +487,18 @@ class ModelManager:
         
         if name in self.models:
             logger.info(f"Model {name} already loaded")
+            self.models.move_to_end(name)
             return
-        
+
         config = self.configs[name]
-        
+
         # Create appropriate model instance
         if config.model_type == "ollama":
             model = OllamaModel(config)
         elif config.model_type == "local":
+            # Make room before pulling another set of weights into
+            # GPU/host RAM; unload() frees the CUDA cache too
+            self._evict_local_models()
             model = LocalTransformersModel(config)
         else:
             raise ValueError(f"Unsupported model type: {config.model_type}")
@@ -311,6 +509,38 @@ class ModelManager:
         
         logger.info(f"Model {name} loaded and ready")
     
+    def _evict_local_models(self) -> None:
+        """Unload least-recently-used local models beyond the cap."""
+        resident = [
+            name for name, model in self.models.items()
+            if isinstance(model, LocalTransformersModel)
+        ]
+        while len(resident) >= self.max_resident:
+            victim = resident.pop(0)
+            logger.info(f"Evicting least recently used local model: {victim}")
+            self.unload_model(victim)
+
+    def ensure_loaded(self, model_name: Optional[str] = None) -> str:
+        """
+        Resolve a model name and make sure the model is loaded.
+
+        Useful as a warmup step that can run concurrently with other
+        work (e.g. retrieval) before the first generate call.
+
+        Args:
+            model_name: Model to warm up (defaults to configured default)
+
+        Returns:
+            The resolved model name
+        """
+        if model_name is None:
+            model_name = self.config.agent.default_model
+
+        if model_name not in self.models:
+            self.load_model(model_name)
+
+        return model_name
+
     def unload_model(self, name: str) -> None:
         """
         Unload a specific model.
@@ -340,17 +570,112 @@ class ModelManager:
         Returns:
             Generated text
         """
+        # Inside a batch_inference context, coalesce with other callers
+        if self._batcher is not None:
+            return self._batcher.submit(prompt, model_name, kwargs).result()
+
+        return self._generate_direct(prompt, model_name, **kwargs)
+
+    def _generate_direct(
+        self,
+        prompt: str,
+        model_name: Optional[str] = None,
+        **kwargs
+    ) -> str:
+        """Generate text immediately, bypassing any active batcher."""
         # Use default model if not specified
         if model_name is None:
             model_name = self.config.agent.default_model
-        
-        # Load model if not already loaded
+
+        # Load model if not already loaded; refresh recency either way
         if model_name not in self.models:
             self.load_model(model_name)
-        
+        else:
+            self.models.move_to_end(model_name)
+
         # Generate
         return self.models[model_name].generate(prompt, **kwargs)
-    
+
+    def stream(
+        self,
+        prompt: str,
+        model_name: Optional[str] = None,
+        **kwargs
+    ):
+        """
+        Stream generated text using a specified model.
+
+        Args:
+            prompt: Input prompt
+            model_name: Model to use (defaults to configured default)
+            **kwargs: Additional generation parameters
+
+        Yields:
+            Chunks of generated text
+        """
+        if model_name is None:
+            model_name = self.config.agent.default_model
+
+        if model_name not in self.models:
+            self.load_model(model_name)
+        else:
+            self.models.move_to_end(model_name)
+
+        return self.models[model_name].generate_stream(prompt, **kwargs)
+
+    def generate_batch(
+        self,
+        prompts: List[str],
+        model_name: Optional[str] = None,
+        **kwargs
+    ) -> List[str]:
+        """
+        Generate completions for several prompts in one batched call.
+
+        The prompts are issued concurrently so backends that handle
+        parallel requests (Ollama, vLLM, TGI) can batch them instead of
+        paying full prefill + decode latency per prompt in sequence.
+
+        Args:
+            prompts: Input prompts
+            model_name: Model to use (defaults to configured default)
+            **kwargs: Additional generation parameters
+
+        Returns:
+            Generated texts, in the same order as the prompts
+        """
+        if not prompts:
+            return []
+
+        logger.info(f"Generating batch of {len(prompts)} prompts")
+        with ThreadPoolExecutor(max_workers=len(prompts)) as executor:
+            return list(executor.map(
+                lambda prompt: self._generate_direct(prompt, model_name, **kwargs),
+                prompts
+            ))
+
+    @contextmanager
+    def batch_inference(self, max_latency_ms: int = 100, max_batch_size: int = 8):
+        """
+        Context manager that micro-batches concurrent generate() calls.
+
+        While active, generate() calls from any thread are coalesced by
+        a background dispatcher: it waits up to max_latency_ms to fill a
+        batch of max_batch_size requests, then issues them together.
+
+        Args:
+            max_latency_ms: Maximum time to wait for a batch to fill
+            max_batch_size: Maximum requests dispatched per batch
+        """
+        batcher = _RequestBatcher(self, max_latency_ms, max_batch_size)
+        self._batcher = batcher
+        try:
+            yield self
+        finally:
+            self._batcher = None
+            batcher.shutdown()
+
+
     def select_best_model(self, task_type: str) -> str:
         """
         Select the best model for a given task type.
@@ -361,22 +686,18 @@ class ModelManager:
         Returns:
             Model name
         """
-        # Heuristic-based model selection
-        task_to_model = {
-            "code": "llama",
-            "reasoning": "llama",
-            "general": "mistral",
-            "fast": "phi",
-            "creative": "mistral",
-        }
-        
-        selected = task_to_model.get(task_type, "mistral")
-        
+        cached = self._selection_cache.get(task_type)
+        if cached is not None:
+            return cached
+
+        selected = self._TASK_TO_MODEL.get(task_type, "mistral")
+
         # Fallback to first available model if selected not in configs
         if selected not in self.configs:
-            selected = list(self.configs.keys())[0] if self.configs else "llama"
-        
+            selected = next(iter(self.configs), "llama")
+
         logger.info(f"Selected model '{selected}' for task type '{task_type}'")
+        self._selection_cache[task_type] = selected
         return selected
     
     def list_models(self) -> List[str]:
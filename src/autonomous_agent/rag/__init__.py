@@ -1,8 +1,10 @@
 """RAG (Retrieval-Augmented Generation) package."""
 
 from .knowledge_base import KnowledgeBase, Document
+from .semantic_cache import SemanticCache
 
 __all__ = [
     "KnowledgeBase",
     "Document",
+    "SemanticCache",
 ]
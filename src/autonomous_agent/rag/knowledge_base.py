@@ -2,19 +2,34 @@
 Knowledge Base implementation using RAG (Retrieval-Augmented Generation).
 """
 
+import atexit
+import copy
 import logging
 from typing import List, Dict, Any, Optional
 from pathlib import Path
 import json
 
+import orjson
+
 from ..config import RAGConfig, get_config
 
 logger = logging.getLogger(__name__)
 
+# Bounds for the repeat-query memoization caches (FIFO eviction)
+_SEARCH_CACHE_SIZE = 1024
+_EMB_CACHE_SIZE = 4096
+
+# Embedding models shared across KnowledgeBase instances, keyed by
+# model name: each SentenceTransformer costs hundreds of MB and
+# seconds to load, so repeat instantiations reuse one copy.
+_EMBEDDERS: Dict[str, Any] = {}
+
 
 class Document:
     """Represents a document in the knowledge base."""
-    
+
+    __slots__ = ('content', 'metadata', 'id')
+
     def __init__(self, content: str, metadata: Optional[Dict[str, Any]] = None):
         self.content = content
         self.metadata = metadata or {}
@@ -38,11 +53,50 @@ class KnowledgeBase:
         
         self.config = config
         self.vector_store = None
-        self.embedding_model = None
-        self.documents: List[Document] = []
-        
-        self._initialize()
-    
+        self._embedding_model = None
+        # Struct-of-arrays document store for the FAISS path: parallel
+        # lists avoid one Python object plus attribute dict per document
+        # and keep result assembly to plain list indexing.
+        self._contents: List[str] = []
+        self._metadatas: List[Dict[str, Any]] = []
+        self._ids: List[str] = []
+
+        # Memoization for repeat queries: query embeddings are a pure
+        # function of the query string, search results additionally
+        # depend on the corpus and are dropped on every write.
+        self._emb_cache: Dict[str, Any] = {}
+        self._search_cache: Dict[Any, List[Dict[str, Any]]] = {}
+
+        # FAISS index persistence is deferred: adds mark the index
+        # dirty and flush() serializes it once, instead of rewriting
+        # the whole index on every insert.
+        self._index_dirty = False
+        atexit.register(self.flush)
+
+        # The vector store and embedding model are created on first
+        # search/add; constructing a KnowledgeBase stays cheap until a
+        # caller actually needs retrieval.
+        self._initialized = False
+
+    @property
+    def embedding_model(self):
+        """Embedding model, initializing the knowledge base on first access."""
+        self._ensure_initialized()
+        return self._embedding_model
+
+    def _ensure_initialized(self) -> None:
+        """Initialize the vector store and embedding model once."""
+        if self._initialized:
+            return
+        # Set the flag before initializing: _initialize itself reads
+        # self.embedding_model, which would otherwise recurse here
+        self._initialized = True
+        try:
+            self._initialize()
+        except Exception:
+            self._initialized = False
+            raise
+
     def _initialize(self) -> None:
         """Initialize the vector store and embedding model."""
         logger.info("Initializing knowledge base...")
@@ -60,12 +114,27 @@ class KnowledgeBase:
     
     def _load_embedding_model(self) -> None:
         """Load the embedding model."""
+        cached = _EMBEDDERS.get(self.config.embedding_model)
+        if cached is not None:
+            self._embedding_model = cached
+            return
+
         try:
+            import torch
             from sentence_transformers import SentenceTransformer
-            
+
+            device = "cuda" if torch.cuda.is_available() else "cpu"
+
             logger.info(f"Loading embedding model: {self.config.embedding_model}")
-            self.embedding_model = SentenceTransformer(self.config.embedding_model)
-            logger.info("Embedding model loaded successfully")
+            self._embedding_model = SentenceTransformer(
+                self.config.embedding_model, device=device
+            )
+            if device == "cuda":
+                # FP16 halves weight and activation bandwidth on GPU
+                # with negligible effect on similarity rankings
+                self._embedding_model.half()
+            _EMBEDDERS[self.config.embedding_model] = self._embedding_model
+            logger.info(f"Embedding model loaded successfully on {device}")
         
         except Exception as e:
             logger.error(f"Error loading embedding model: {e}")
@@ -104,12 +173,47 @@ class KnowledgeBase:
             import faiss
             import numpy as np
             
-            # Get embedding dimension
-            sample_embedding = self.embedding_model.encode(["test"])
-            dimension = sample_embedding.shape[1]
-            
-            # Create FAISS index
-            self.vector_store = faiss.IndexFlatL2(dimension)
+            # Read the embedding dimension from the model's metadata
+            # instead of paying a probe forward pass at startup
+            dimension = self.embedding_model.get_sentence_embedding_dimension()
+            if dimension is None:
+                dimension = self.embedding_model.encode(["test"]).shape[1]
+
+            # Create FAISS index. The default is an HNSW graph over
+            # inner-product space: embeddings are L2-normalized at
+            # encode time, so inner product equals cosine similarity
+            # (matching ChromaDB's space) and queries traverse the
+            # graph in roughly logarithmic time instead of scanning
+            # every vector.
+            # Stored vectors are scalar-quantized per embedding_dtype:
+            # similarity search is memory-bound, so fp16 (or int8)
+            # storage halves (or quarters) the bytes moved per query
+            # on top of the RAM savings.
+            quantizer_types = {
+                "float16": faiss.ScalarQuantizer.QT_fp16,
+                "int8": faiss.ScalarQuantizer.QT_8bit,
+            }
+            qtype = quantizer_types.get(self.config.embedding_dtype)
+
+            if self.config.faiss_index_type == "hnsw":
+                if qtype is None:
+                    index = faiss.IndexHNSWFlat(
+                        dimension, self.config.hnsw_m, faiss.METRIC_INNER_PRODUCT
+                    )
+                else:
+                    index = faiss.IndexHNSWSQ(
+                        dimension, qtype, self.config.hnsw_m,
+                        faiss.METRIC_INNER_PRODUCT
+                    )
+                index.hnsw.efConstruction = self.config.hnsw_ef_construction
+                index.hnsw.efSearch = self.config.hnsw_ef_search
+                self.vector_store = index
+            elif qtype is not None:
+                self.vector_store = faiss.IndexScalarQuantizer(
+                    dimension, qtype, faiss.METRIC_INNER_PRODUCT
+                )
+            else:
+                self.vector_store = faiss.IndexFlatIP(dimension)
             
             # Try to load existing index
             db_path = Path(self.config.vector_db_path)
@@ -117,7 +221,11 @@ class KnowledgeBase:
             index_path = db_path / "faiss.index"
             
             if index_path.exists():
-                self.vector_store = faiss.read_index(str(index_path))
+                # Memory-map the stored index so startup doesn't pull
+                # the whole file into RAM up front
+                self.vector_store = faiss.read_index(
+                    str(index_path), faiss.IO_FLAG_MMAP
+                )
                 logger.info(f"Loaded existing FAISS index from {index_path}")
             else:
                 logger.info("Created new FAISS index")
@@ -138,12 +246,24 @@ class KnowledgeBase:
         """Add multiple documents to the knowledge base."""
         if not contents:
             return []
+
+        self._ensure_initialized()
         
         if metadatas is None:
             metadatas = [{}] * len(contents)
-        
-        # Generate embeddings
-        embeddings = self.embedding_model.encode(contents)
+
+        # Cached search results are stale once the corpus changes;
+        # query embeddings stay valid (pure function of the query)
+        self._search_cache.clear()
+
+        # Generate embeddings in a single batched call, L2-normalized
+        # so inner product equals cosine in every backend
+        embeddings = self.embedding_model.encode(
+            contents,
+            batch_size=128,
+            convert_to_numpy=True,
+            normalize_embeddings=True
+        )
         
         # Add to vector store
         if self.config.vector_db_type == "chromadb":
@@ -180,36 +300,63 @@ class KnowledgeBase:
     ) -> List[str]:
         """Add documents to FAISS."""
         import uuid
-        
+
+        import numpy as np
+
+        # FAISS expects float32 input even for quantized storage; the
+        # encoder may emit fp16 when running on GPU
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+
+        # Quantized indexes (int8 scalar quantization) need range
+        # statistics before the first add; fp16/flat report trained
+        if not self.vector_store.is_trained:
+            self.vector_store.train(embeddings)
+
         # Add embeddings to index
         self.vector_store.add(embeddings)
         
         # Store documents and metadata separately
         ids = [str(uuid.uuid4()) for _ in contents]
-        for content, metadata, doc_id in zip(contents, metadatas, ids):
-            doc = Document(content, metadata)
-            doc.id = doc_id
-            self.documents.append(doc)
-        
-        # Save index
-        self._save_faiss_index()
-        
+        self._contents.extend(contents)
+        self._metadatas.extend(metadatas)
+        self._ids.extend(ids)
+
+        # Append only the new documents to the log and defer the index
+        # write to flush(); rewriting everything per insert made adds
+        # O(N) I/O each, O(N^2) over a growing corpus.
+        self._append_documents(contents, metadatas)
+        self._index_dirty = True
+
         logger.info(f"Added {len(contents)} documents to FAISS")
         return ids
-    
-    def _save_faiss_index(self) -> None:
-        """Save FAISS index to disk."""
+
+    def _append_documents(
+        self,
+        contents: List[str],
+        metadatas: List[Dict[str, Any]]
+    ) -> None:
+        """Append documents to the newline-delimited JSON log."""
+        docs_path = Path(self.config.vector_db_path) / "documents.jsonl"
+        with open(docs_path, 'ab') as f:
+            for content, metadata in zip(contents, metadatas):
+                f.write(orjson.dumps(
+                    {"content": content, "metadata": metadata}
+                ) + b'\n')
+
+    def flush(self) -> None:
+        """Persist the FAISS index if it has unsaved additions.
+
+        Registered with atexit, so pending additions are written at
+        interpreter shutdown even if no caller flushes explicitly.
+        """
+        if not self._index_dirty:
+            return
+
         import faiss
-        
-        db_path = Path(self.config.vector_db_path)
-        index_path = db_path / "faiss.index"
-        docs_path = db_path / "documents.json"
-        
+
+        index_path = Path(self.config.vector_db_path) / "faiss.index"
         faiss.write_index(self.vector_store, str(index_path))
-        
-        # Save documents
-        with open(docs_path, 'w') as f:
-            json.dump([doc.to_dict() for doc in self.documents], f)
+        self._index_dirty = False
     
     def search(
         self,
@@ -217,83 +364,196 @@ class KnowledgeBase:
         top_k: Optional[int] = None,
         filter_metadata: Optional[Dict[str, Any]] = None
     ) -> List[Dict[str, Any]]:
-        """Search for relevant documents."""
+        """Search for relevant documents.
+
+        Thin wrapper over search_batch so both paths share one encode
+        and one vector store round trip.
+        """
+        return self.search_batch([query], top_k, filter_metadata)[0]
+    
+    def search_batch(
+        self,
+        queries: List[str],
+        top_k: Optional[int] = None,
+        filter_metadata: Optional[Dict[str, Any]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """Search for relevant documents for several queries at once.
+
+        All queries are embedded in one batched model call and searched
+        in a single vector store request, instead of one transformer
+        forward pass and one index probe per query.
+        """
+        if not queries:
+            return []
+
+        self._ensure_initialized()
+
         if top_k is None:
             top_k = self.config.top_k_results
-        
-        # Generate query embedding
-        query_embedding = self.embedding_model.encode([query])
-        
-        # Search in vector store
+
+        # Serve repeat queries straight from the result cache; only the
+        # misses pay for embedding and index probes.
+        filter_key = (
+            json.dumps(filter_metadata, sort_keys=True)
+            if filter_metadata else None
+        )
+        results: List[Optional[List[Dict[str, Any]]]] = [None] * len(queries)
+        miss_positions = []
+        for i, query in enumerate(queries):
+            cached = self._search_cache.get((query, top_k, filter_key))
+            if cached is not None:
+                results[i] = copy.deepcopy(cached)
+            else:
+                miss_positions.append(i)
+
+        if not miss_positions:
+            return results
+
+        miss_queries = [queries[i] for i in miss_positions]
+        query_embeddings = self._encode_queries(miss_queries)
+
         if self.config.vector_db_type == "chromadb":
-            return self._search_chromadb(query_embedding, top_k, filter_metadata)
+            batches = self._search_chromadb_batch(
+                query_embeddings, top_k, filter_metadata
+            )
         elif self.config.vector_db_type == "faiss":
-            return self._search_faiss(query_embedding, top_k)
-    
-    def _search_chromadb(
+            batches = self._search_faiss_batch(query_embeddings, top_k)
+
+        for i, documents in zip(miss_positions, batches):
+            self._cache_put(
+                self._search_cache, _SEARCH_CACHE_SIZE,
+                (queries[i], top_k, filter_key), copy.deepcopy(documents)
+            )
+            results[i] = documents
+
+        return results
+
+    def embed_query(self, query: str) -> Any:
+        """Embed a single query through the embedding memo cache.
+
+        Callers that need a query vector (e.g. the agent's semantic
+        cache probe) should use this instead of calling the embedding
+        model directly: the first encode seeds the cache, so a search
+        for the same query immediately afterwards reuses the vector
+        instead of paying a second forward pass.
+        """
+        self._ensure_initialized()
+        return self._encode_queries([query])[0]
+
+    def _encode_queries(self, queries: List[str]) -> Any:
+        """Embed queries, reusing cached embeddings for repeats."""
+        import numpy as np
+
+        embeddings = {
+            query: self._emb_cache[query]
+            for query in queries if query in self._emb_cache
+        }
+        to_encode = [q for q in dict.fromkeys(queries) if q not in embeddings]
+        if to_encode:
+            # Embed every miss in one batched call, normalized to
+            # match the stored vectors
+            encoded = self.embedding_model.encode(
+                to_encode,
+                batch_size=len(to_encode),
+                convert_to_numpy=True,
+                normalize_embeddings=True
+            )
+            for query, embedding in zip(to_encode, encoded):
+                embeddings[query] = embedding
+                self._cache_put(
+                    self._emb_cache, _EMB_CACHE_SIZE, query, embedding
+                )
+        return np.stack([embeddings[query] for query in queries])
+
+    @staticmethod
+    def _cache_put(cache: Dict, max_entries: int, key: Any, value: Any) -> None:
+        """Insert into a memo dict, evicting the oldest entry when full."""
+        if len(cache) >= max_entries and key not in cache:
+            del cache[next(iter(cache))]
+        cache[key] = value
+
+    def _search_chromadb_batch(
         self,
-        query_embedding: Any,
+        query_embeddings: Any,
         top_k: int,
         filter_metadata: Optional[Dict[str, Any]]
-    ) -> List[Dict[str, Any]]:
-        """Search in ChromaDB."""
+    ) -> List[List[Dict[str, Any]]]:
+        """Search several query embeddings in ChromaDB with one request."""
         results = self.vector_store.query(
-            query_embeddings=query_embedding.tolist(),
+            query_embeddings=query_embeddings.tolist(),
             n_results=top_k,
             where=filter_metadata
         )
-        
-        documents = []
-        for i in range(len(results['documents'][0])):
-            doc = {
-                'content': results['documents'][0][i],
-                'metadata': results['metadatas'][0][i],
-                'distance': results['distances'][0][i],
-                'id': results['ids'][0][i]
-            }
-            documents.append(doc)
-        
-        return documents
-    
-    def _search_faiss(
+
+        # Walk the four parallel result lists with zip instead of
+        # re-indexing each one per hit
+        return [
+            [
+                {
+                    'content': content,
+                    'metadata': metadata,
+                    'distance': distance,
+                    'id': doc_id
+                }
+                for content, metadata, distance, doc_id in zip(
+                    documents, metadatas, distances, ids
+                )
+            ]
+            for documents, metadatas, distances, ids in zip(
+                results['documents'], results['metadatas'],
+                results['distances'], results['ids']
+            )
+        ]
+
+    def _search_faiss_batch(
         self,
-        query_embedding: Any,
+        query_embeddings: Any,
         top_k: int
-    ) -> List[Dict[str, Any]]:
-        """Search in FAISS."""
-        distances, indices = self.vector_store.search(query_embedding, top_k)
-        
-        documents = []
-        for i, idx in enumerate(indices[0]):
-            if idx < len(self.documents):
-                doc = self.documents[idx]
-                documents.append({
-                    'content': doc.content,
-                    'metadata': doc.metadata,
-                    'distance': float(distances[0][i]),
-                    'id': doc.id
-                })
-        
-        return documents
-    
+    ) -> List[List[Dict[str, Any]]]:
+        """Search several query embeddings in FAISS with one call."""
+        import numpy as np
+
+        query_embeddings = np.asarray(query_embeddings, dtype=np.float32)
+        distances, indices = self.vector_store.search(query_embeddings, top_k)
+
+        return [
+            [
+                {
+                    'content': self._contents[idx],
+                    'metadata': self._metadatas[idx],
+                    'distance': float(distance),
+                    'id': self._ids[idx]
+                }
+                for idx, distance in zip(row_indices, row_distances)
+                if idx < len(self._ids)
+            ]
+            for row_indices, row_distances in zip(indices, distances)
+        ]
+
     def get_context(self, query: str, max_length: int = 2000) -> str:
         """Get context for a query by retrieving relevant documents."""
+        import numpy as np
+
         results = self.search(query)
-        
-        context_parts = []
-        total_length = 0
-        
-        for result in results:
-            content = result['content']
-            if total_length + len(content) > max_length:
-                break
-            context_parts.append(content)
-            total_length += len(content)
-        
-        return "\n\n".join(context_parts)
+        if not results:
+            return ""
+
+        # Find the cutoff with one cumulative-sum pass in C instead of
+        # a Python accumulation loop; as before, documents are taken in
+        # order until the running content length would exceed the budget
+        lengths = np.fromiter(
+            (len(r['content']) for r in results),
+            dtype=np.int64,
+            count=len(results)
+        )
+        cutoff = int(np.searchsorted(np.cumsum(lengths), max_length, side='right'))
+
+        return "\n\n".join(r['content'] for r in results[:cutoff])
     
     def clear(self) -> None:
         """Clear all documents from the knowledge base."""
+        self._ensure_initialized()
+        self._search_cache.clear()
         try:
             if self.config.vector_db_type == "chromadb":
                 # ChromaDB: delete the collection and recreate it
@@ -306,7 +566,9 @@ class KnowledgeBase:
                 self._initialize_chromadb()
             elif self.config.vector_db_type == "faiss":
                 self._initialize_faiss()
-                self.documents = []
+                self._contents = []
+                self._metadatas = []
+                self._ids = []
             
             logger.info("Knowledge base cleared")
         except Exception as e:
@@ -0,0 +1,283 @@
+"""
+Semantic cache for near-duplicate queries.
+
+Uses random-projection LSH over query embeddings so that paraphrased
+queries ("advantages of open-source LLMs" vs "benefits of open-source
+language models") can short-circuit both retrieval and generation.
+"""
+
+import logging
+import time
+from collections import defaultdict
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+try:
+    from numba import njit, prange
+
+    @njit(cache=True, parallel=True, fastmath=True)
+    def _cosine_scores_kernel(query, matrix, query_scale, scales):  # pragma: no cover
+        """Dot each int8 candidate row against the int8 query, rescaling to cosine."""
+        n = matrix.shape[0]
+        dimension = matrix.shape[1]
+        out = np.empty(n, dtype=np.float32)
+        for i in prange(n):
+            acc = np.int32(0)
+            for d in range(dimension):
+                acc += np.int32(query[d]) * np.int32(matrix[i, d])
+            out[i] = acc * query_scale * scales[i]
+        return out
+
+    @njit(cache=True, fastmath=True)
+    def _signatures_kernel(vector, projections, bit_weights):  # pragma: no cover
+        """Pack sign bits of the projected vector into one int per table."""
+        num_tables = projections.shape[0]
+        dimension = projections.shape[1]
+        hash_bits = projections.shape[2]
+        out = np.zeros(num_tables, dtype=np.int64)
+        for t in range(num_tables):
+            signature = 0
+            for b in range(hash_bits):
+                acc = 0.0
+                for d in range(dimension):
+                    acc += vector[d] * projections[t, d, b]
+                if acc > 0.0:
+                    signature += bit_weights[b]
+            out[t] = signature
+        return out
+
+    _HAS_NUMBA = True
+except ImportError:
+    _HAS_NUMBA = False
+
+try:
+    import hnswlib
+    _HAS_HNSWLIB = True
+except ImportError:
+    _HAS_HNSWLIB = False
+
+# Upper bound on the entry count at which lookups switch from the
+# LSH-bucketed rerank to an HNSW graph; below the crossover the flat
+# path is faster than the graph traversal overhead. Each cache caps
+# this to its own capacity (see __init__), since a cache whose
+# max_entries never reaches this bound would otherwise never switch.
+HNSW_CROSSOVER = 10_000
+
+
+class SemanticCache:
+    """LSH-backed cache mapping query embeddings to stored results.
+
+    Maintains ``num_tables`` hash tables of ``hash_bits``-bit
+    random-projection signatures. Lookups hash the query into each
+    table, union the candidate buckets, rerank candidates by exact
+    cosine similarity, and return the stored value when the best
+    similarity clears the threshold.
+    """
+
+    def __init__(
+        self,
+        dimension: int,
+        threshold: float = 0.95,
+        num_tables: int = 8,
+        hash_bits: int = 16,
+        max_entries: int = 1024,
+        ttl_seconds: Optional[float] = None,
+        seed: int = 0
+    ):
+        """
+        Initialize the semantic cache.
+
+        Args:
+            dimension: Embedding dimension
+            threshold: Minimum cosine similarity for a cache hit
+            num_tables: Number of LSH hash tables
+            hash_bits: Signature width per table
+            max_entries: Maximum number of cached entries
+            ttl_seconds: Entry lifetime; None disables expiry
+            seed: Seed for the random projections
+        """
+        self.dimension = dimension
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+        # add() starts the cache fresh once it reaches max_entries, so a
+        # fixed crossover larger than the capacity could never be hit;
+        # cap it at half the capacity so the graph serves the second
+        # half of each fill cycle.
+        self._hnsw_crossover = min(HNSW_CROSSOVER, max(2, max_entries // 2))
+
+        rng = np.random.default_rng(seed)
+        # (num_tables, dimension, hash_bits) Gaussian projections
+        self._projections = rng.standard_normal(
+            (num_tables, dimension, hash_bits)
+        ).astype(np.float32)
+        self._bit_weights = (1 << np.arange(hash_bits)).astype(np.int64)
+
+        self._tables: List[Dict[int, List[int]]] = [
+            defaultdict(list) for _ in range(num_tables)
+        ]
+        # Embeddings are stored int8-quantized (4x smaller than float32)
+        # with one dequantization scale per vector.
+        self._embeddings: List[np.ndarray] = []
+        self._scales: List[float] = []
+        self._values: List[Dict[str, Any]] = []
+        self._inserted_at: List[float] = []
+
+        # HNSW index, built lazily once the cache crosses the crossover
+        self._hnsw = None
+
+        self.hits = 0
+        self.misses = 0
+
+    def _normalize(self, embedding: np.ndarray) -> np.ndarray:
+        """L2-normalize an embedding so cosine reduces to a dot product."""
+        vector = np.asarray(embedding, dtype=np.float32).reshape(-1)
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector = vector / norm
+        return vector
+
+    @staticmethod
+    def _quantize(vector: np.ndarray) -> Tuple[np.ndarray, float]:
+        """Symmetrically quantize a vector to int8 plus a dequant scale."""
+        max_abs = float(np.abs(vector).max())
+        if max_abs == 0.0:
+            return np.zeros(vector.shape, dtype=np.int8), 0.0
+        quantized = np.clip(
+            np.rint(vector * (127.0 / max_abs)), -127, 127
+        ).astype(np.int8)
+        return quantized, max_abs / 127.0
+
+    def _signatures(self, vector: np.ndarray) -> np.ndarray:
+        """Compute the per-table LSH signatures for a normalized vector."""
+        if _HAS_NUMBA:
+            return _signatures_kernel(vector, self._projections, self._bit_weights)
+        # (num_tables, hash_bits) sign bits packed into one int per table
+        bits = (vector @ self._projections) > 0
+        return bits @ self._bit_weights
+
+    def get(self, embedding: np.ndarray) -> Optional[Dict[str, Any]]:
+        """Look up the cached value for a query embedding, if any."""
+        if not self._values:
+            self.misses += 1
+            return None
+
+        vector = self._normalize(embedding)
+
+        # Above the crossover, answer from the HNSW graph in O(log N)
+        if self._hnsw is not None:
+            labels, distances = self._hnsw.knn_query(vector, k=1)
+            best = int(labels[0][0])
+            similarity = 1.0 - float(distances[0][0])
+            if similarity >= self.threshold and not self._expired(best):
+                self.hits += 1
+                return self._values[best]
+            self.misses += 1
+            return None
+
+        signatures = self._signatures(vector)
+
+        candidates = set()
+        for table, signature in zip(self._tables, signatures):
+            candidates.update(table.get(int(signature), ()))
+
+        if not candidates:
+            self.misses += 1
+            return None
+
+        # Rerank candidates by cosine similarity directly in int8:
+        # embeddings are normalized then quantized on insert, so the
+        # integer dot product rescaled by both scales is the cosine.
+        indices = sorted(candidates)
+        matrix = np.stack([self._embeddings[i] for i in indices])
+        scales = np.array([self._scales[i] for i in indices], dtype=np.float32)
+        query_int8, query_scale = self._quantize(vector)
+        if _HAS_NUMBA:
+            scores = _cosine_scores_kernel(
+                query_int8, matrix, np.float32(query_scale), scales
+            )
+        else:
+            scores = (matrix.astype(np.int32) @ query_int8.astype(np.int32)) \
+                * query_scale * scales
+        best = int(scores.argmax())
+
+        if scores[best] >= self.threshold and not self._expired(indices[best]):
+            self.hits += 1
+            return self._values[indices[best]]
+
+        self.misses += 1
+        return None
+
+    def _expired(self, index: int) -> bool:
+        """Check whether a cached entry has outlived its TTL."""
+        if self.ttl_seconds is None:
+            return False
+        return time.monotonic() - self._inserted_at[index] >= self.ttl_seconds
+
+    def add(self, embedding: np.ndarray, value: Dict[str, Any]) -> None:
+        """Add an embedding/value pair to the cache."""
+        if len(self._values) >= self.max_entries:
+            # Cache is full; rebuilding the tables on eviction is not
+            # worth it for this workload, so start fresh instead.
+            self.clear(reset_stats=False)
+
+        vector = self._normalize(embedding)
+        quantized, scale = self._quantize(vector)
+        index = len(self._values)
+        self._embeddings.append(quantized)
+        self._scales.append(scale)
+        self._values.append(value)
+        self._inserted_at.append(time.monotonic())
+
+        for table, signature in zip(self._tables, self._signatures(vector)):
+            table[int(signature)].append(index)
+
+        if self._hnsw is not None:
+            self._hnsw.add_items(vector.reshape(1, -1), [index])
+        else:
+            self._maybe_build_hnsw()
+
+    def _maybe_build_hnsw(self) -> None:
+        """Build the HNSW index once the cache crosses the crossover size."""
+        if not _HAS_HNSWLIB or len(self._values) < self._hnsw_crossover:
+            return
+
+        index = hnswlib.Index(space='cosine', dim=self.dimension)
+        index.init_index(max_elements=self.max_entries, ef_construction=200, M=16)
+
+        # Dequantize the stored int8 vectors for the graph build
+        matrix = np.stack([
+            embedding.astype(np.float32) * scale
+            for embedding, scale in zip(self._embeddings, self._scales)
+        ])
+        index.add_items(matrix, np.arange(len(self._values)))
+
+        self._hnsw = index
+        logger.info(f"Semantic cache switched to HNSW at {len(self._values)} entries")
+
+    def clear(self, reset_stats: bool = True) -> None:
+        """Drop all cached entries (e.g. after a knowledge base update)."""
+        for table in self._tables:
+            table.clear()
+        self._embeddings = []
+        self._scales = []
+        self._values = []
+        self._inserted_at = []
+        self._hnsw = None
+        if reset_stats:
+            self.hits = 0
+            self.misses = 0
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get cache hit/miss statistics."""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._values),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0
+        }
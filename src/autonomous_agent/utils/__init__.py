@@ -8,6 +8,7 @@ from .text_utils import (
     calculate_token_estimate,
     merge_dicts_deep
 )
+from .tiered_cache import TieredCache
 
 __all__ = [
     "chunk_text",
@@ -16,4 +17,5 @@ __all__ = [
     "format_prompt_with_examples",
     "calculate_token_estimate",
     "merge_dicts_deep",
+    "TieredCache",
 ]
@@ -1,45 +1,90 @@
 """Utility functions for the autonomous research agent."""
 
 from typing import List, Dict, Any
+from collections import OrderedDict
 import re
 
+# Compiled once at import; re.finditer would otherwise re-parse the
+# pattern (or at least hit the internal compile cache) on every call
+_CODE_BLOCK_RE = re.compile(r'```(\w+)?\n(.*?)```', re.DOTALL)
+
+try:
+    import tiktoken
+    _TOKEN_ENCODER = tiktoken.get_encoding("cl100k_base")
+except ImportError:
+    _TOKEN_ENCODER = None
+
+# LRU of recent chunk_text results: the agent re-chunks the same
+# document across retries and analysis passes. Keyed by the text's
+# hash (cached on the str object after first use) with the text kept
+# in the entry so a hash collision can never return the wrong chunks.
+_CHUNK_CACHE: "OrderedDict" = OrderedDict()
+_CHUNK_CACHE_SIZE = 64
+
 
 def chunk_text(text: str, chunk_size: int = 512, overlap: int = 50) -> List[str]:
     """
     Split text into chunks with overlap.
-    
+
     Args:
         text: Text to chunk
         chunk_size: Maximum size of each chunk
         overlap: Number of characters to overlap between chunks
-    
+
     Returns:
         List of text chunks
     """
     if len(text) <= chunk_size:
         return [text]
-    
-    chunks = []
+
+    cache_key = (hash(text), chunk_size, overlap)
+    cached = _CHUNK_CACHE.get(cache_key)
+    if cached is not None and cached[0] == text:
+        _CHUNK_CACHE.move_to_end(cache_key)
+        return list(cached[1])
+
+    # An overlap as large as the chunk would prevent forward progress
+    if overlap >= chunk_size:
+        overlap = chunk_size // 4
+
+    # First pass computes (start, end) spans with integer math only;
+    # the chunks are materialized afterwards in one comprehension. The
+    # spans stay data-dependent because each sentence break shifts
+    # where the next chunk starts.
+    spans = []
     start = 0
-    
+    # Integer half keeps the break-point comparison in int space; for
+    # integral break_point, > (chunk_size >> 1) and > chunk_size * 0.5
+    # accept exactly the same values
+    half_chunk = chunk_size >> 1
+
     while start < len(text):
         end = start + chunk_size
-        
-        # Try to break at sentence boundary
+
+        # Try to break at sentence boundary; search the original
+        # string with bounded rfind instead of slicing out a copy
         if end < len(text):
             # Look for sentence endings
-            chunk = text[start:end]
-            last_period = chunk.rfind('.')
-            last_newline = chunk.rfind('\n')
-            break_point = max(last_period, last_newline)
-            
-            if break_point > chunk_size * 0.5:  # Only use if in latter half
+            last_period = text.rfind('.', start, end)
+            last_newline = text.rfind('\n', start, end)
+            break_point = max(last_period, last_newline) - start
+
+            if break_point > half_chunk:  # Only use if in latter half
                 end = start + break_point + 1
-        
-        chunks.append(text[start:end].strip())
-        start = end - overlap
-    
-    return chunks
+
+        spans.append((start, end))
+        # Always advance: an early sentence break can land end - overlap
+        # at or before start, which would loop forever
+        new_start = end - overlap
+        start = new_start if new_start > start else end
+
+    chunks = [text[s:e].strip() for s, e in spans]
+
+    _CHUNK_CACHE[cache_key] = (text, chunks)
+    if len(_CHUNK_CACHE) > _CHUNK_CACHE_SIZE:
+        _CHUNK_CACHE.popitem(last=False)
+
+    return list(chunks)
 
 
 def extract_code_blocks(text: str) -> List[Dict[str, str]]:
@@ -52,18 +97,19 @@ def extract_code_blocks(text: str) -> List[Dict[str, str]]:
     Returns:
         List of dictionaries with 'language' and 'code' keys
     """
-    pattern = r'```(\w+)?\n(.*?)```'
-    matches = re.finditer(pattern, text, re.DOTALL)
-    
+    # Most responses carry no fences at all; one memchr-style scan
+    # short-circuits before the DOTALL regex runs
+    if '```' not in text:
+        return []
+
     code_blocks = []
-    for match in matches:
-        language = match.group(1) or 'text'
-        code = match.group(2).strip()
+    for match in _CODE_BLOCK_RE.finditer(text):
+        language, code = match.group(1, 2)
         code_blocks.append({
-            'language': language,
-            'code': code
+            'language': language or 'text',
+            'code': code.strip()
         })
-    
+
     return code_blocks
 
 
@@ -81,10 +127,46 @@ def truncate_text(text: str, max_length: int = 500, suffix: str = "...") -> str:
     """
     if len(text) <= max_length:
         return text
-    
+
+    if not suffix:
+        return text[:max_length]
+
     return text[:max_length - len(suffix)] + suffix
 
 
+class _ExampleFormatter:
+    """Pre-rendered query-independent prefix of a few-shot prompt.
+
+    The task and example block never change between queries, so it is
+    rendered once; format() only appends the per-query tail.
+    """
+
+    __slots__ = ('_prefix',)
+
+    def __init__(self, task: str, examples: List[Dict[str, str]]):
+        def lines():
+            yield task
+            yield ""
+            for i, example in enumerate(examples, 1):
+                yield f"Example {i}:"
+                yield f"Input: {example['input']}"
+                yield f"Output: {example['output']}"
+                yield ""
+            yield "Now, for the following input:"
+
+        self._prefix = "\n".join(lines())
+
+    def format(self, query: str) -> str:
+        return f"{self._prefix}\nInput: {query}\nOutput:"
+
+
+# Rendered prefixes keyed by task and example contents, so prompt
+# tuning loops that re-format the same examples against many queries
+# only pay for the query tail
+_FORMATTER_CACHE: "OrderedDict" = OrderedDict()
+_FORMATTER_CACHE_SIZE = 32
+
+
 def format_prompt_with_examples(
     task: str,
     examples: List[Dict[str, str]],
@@ -92,41 +174,45 @@ def format_prompt_with_examples(
 ) -> str:
     """
     Format a few-shot prompt with examples.
-    
+
     Args:
         task: Task description
         examples: List of example dicts with 'input' and 'output' keys
         query: Current query
-    
+
     Returns:
         Formatted prompt
     """
-    prompt_parts = [task, ""]
-    
-    for i, example in enumerate(examples, 1):
-        prompt_parts.append(f"Example {i}:")
-        prompt_parts.append(f"Input: {example['input']}")
-        prompt_parts.append(f"Output: {example['output']}")
-        prompt_parts.append("")
-    
-    prompt_parts.append(f"Now, for the following input:")
-    prompt_parts.append(f"Input: {query}")
-    prompt_parts.append("Output:")
-    
-    return "\n".join(prompt_parts)
+    cache_key = (task, tuple(
+        (example['input'], example['output']) for example in examples
+    ))
+    formatter = _FORMATTER_CACHE.get(cache_key)
+    if formatter is None:
+        formatter = _ExampleFormatter(task, examples)
+        _FORMATTER_CACHE[cache_key] = formatter
+        if len(_FORMATTER_CACHE) > _FORMATTER_CACHE_SIZE:
+            _FORMATTER_CACHE.popitem(last=False)
+    else:
+        _FORMATTER_CACHE.move_to_end(cache_key)
+
+    return formatter.format(query)
 
 
 def calculate_token_estimate(text: str) -> int:
     """
     Estimate token count for text.
-    Simple approximation: ~4 characters per token.
-    
+    Uses tiktoken when available (exact for OpenAI-style tokenizers,
+    close for others); otherwise falls back to the ~4 characters per
+    token approximation, which undercounts code-heavy text.
+
     Args:
         text: Text to estimate
-    
+
     Returns:
         Estimated token count
     """
+    if _TOKEN_ENCODER is not None:
+        return len(_TOKEN_ENCODER.encode(text, disallowed_special=()))
     return len(text) // 4
 
 
@@ -141,12 +227,23 @@ def merge_dicts_deep(dict1: Dict[Any, Any], dict2: Dict[Any, Any]) -> Dict[Any,
     Returns:
         Merged dictionary
     """
-    result = dict1.copy()
-    
-    for key, value in dict2.items():
-        if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-            result[key] = merge_dicts_deep(result[key], value)
-        else:
-            result[key] = value
-    
+    # Iterative merge with copy-on-write: sub-dicts are shallow-copied
+    # only when dict2 actually touches them, and deep configs can't
+    # exhaust the recursion stack
+    result = dict(dict1)
+    stack = [(result, dict2)]
+
+    while stack:
+        dst, src = stack.pop()
+        for key, value in src.items():
+            existing = dst.get(key)
+            # Exact-type check is a single pointer compare; dict
+            # subclasses fall through to plain replacement, which is
+            # acceptable for config merging
+            if type(existing) is dict and type(value) is dict:
+                dst[key] = dict(existing)
+                stack.append((dst[key], value))
+            else:
+                dst[key] = value
+
     return result
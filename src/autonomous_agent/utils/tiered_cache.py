@@ -0,0 +1,149 @@
+"""
+Tiered response cache combining LRU, LFU, and TTL eviction.
+
+Entries age out after a configurable TTL, and when the cache is full the
+eviction victim is chosen by a combined score over recency, access
+frequency, and remaining lifetime rather than recency alone.
+"""
+
+import heapq
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CacheEntry:
+    """A single cached value with its eviction bookkeeping."""
+
+    value: Any
+    expires_at: Optional[float]
+    last_access: float
+    hits: int = 0
+    doc_ids: Set[str] = field(default_factory=set)
+
+
+class TieredCache:
+    """Key/value cache with LRU + LFU + TTL eviction.
+
+    Lookups refresh recency and bump the entry's hit counter. When the
+    cache is full, the victim is the entry with the lowest combined
+    score ``alpha * recency + beta * frequency + gamma * remaining_ttl``
+    (all components normalized to comparable ranges). Entries can also
+    track the knowledge base document IDs their value was derived from,
+    so a document update invalidates exactly the answers built on it.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 128,
+        ttl_seconds: Optional[float] = None,
+        alpha: float = 1.0,
+        beta: float = 1.0,
+        gamma: float = 1.0
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached entries
+            ttl_seconds: Entry lifetime; None disables expiry
+            alpha: Weight of recency in the eviction score
+            beta: Weight of access frequency in the eviction score
+            gamma: Weight of remaining TTL in the eviction score
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.alpha = alpha
+        self.beta = beta
+        self.gamma = gamma
+        self._entries: Dict[str, CacheEntry] = {}
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for a key, or None if absent/expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        now = time.monotonic()
+        if entry.expires_at is not None and now >= entry.expires_at:
+            del self._entries[key]
+            return None
+
+        entry.hits += 1
+        entry.last_access = now
+        return entry.value
+
+    def put(self, key: str, value: Any, doc_ids: Optional[Set[str]] = None) -> None:
+        """Store a value, evicting the lowest-scored entry when full."""
+        if key not in self._entries and len(self._entries) >= self.max_entries:
+            self._evict()
+
+        now = time.monotonic()
+        expires_at = now + self.ttl_seconds if self.ttl_seconds is not None else None
+        self._entries[key] = CacheEntry(
+            value=value,
+            expires_at=expires_at,
+            last_access=now,
+            doc_ids=doc_ids or set()
+        )
+
+    def _evict(self) -> None:
+        """Drop expired entries, then the lowest-scored entry if still full."""
+        now = time.monotonic()
+
+        expired = [
+            key for key, entry in self._entries.items()
+            if entry.expires_at is not None and now >= entry.expires_at
+        ]
+        for key in expired:
+            del self._entries[key]
+        if len(self._entries) < self.max_entries:
+            return
+
+        victims = heapq.nsmallest(
+            1,
+            self._entries.items(),
+            key=lambda item: self._score(item[1], now)
+        )
+        if victims:
+            del self._entries[victims[0][0]]
+
+    def _score(self, entry: CacheEntry, now: float) -> float:
+        """Combined eviction score; lower scores are evicted first."""
+        recency = 1.0 / (1.0 + (now - entry.last_access))
+        frequency = entry.hits / (1.0 + entry.hits)
+        if entry.expires_at is None or self.ttl_seconds is None:
+            remaining_ttl = 1.0
+        else:
+            remaining_ttl = max(0.0, entry.expires_at - now) / self.ttl_seconds
+        return self.alpha * recency + self.beta * frequency + self.gamma * remaining_ttl
+
+    def remove_by_doc_id(self, doc_id: str) -> int:
+        """Invalidate entries derived from a knowledge base document.
+
+        Args:
+            doc_id: Document ID whose dependent entries should be dropped
+
+        Returns:
+            Number of entries removed
+        """
+        stale = [
+            key for key, entry in self._entries.items()
+            if doc_id in entry.doc_ids
+        ]
+        for key in stale:
+            del self._entries[key]
+        if stale:
+            logger.info(f"Invalidated {len(stale)} cached entries for doc {doc_id}")
+        return len(stale)
+
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -3,125 +3,204 @@ Formatter module for generating multi-format outputs.
 Supports Markdown, JSON, HTML, BibTeX, CSV, and Mermaid diagrams.
 """
 
-import json
 import csv
 import io
 import re
 import logging
+
+import orjson
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Any
 from datetime import datetime
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Compiled once at import; the escaped dot also stops 'arxivXorg'-style
+# hosts from matching
+_ARXIV_ID_RE = re.compile(r'arxiv\.org/abs/(\d+\.\d+)')
+
+# Single C-pass character substitution for Mermaid node labels
+_MERMAID_QUOTE_TRANS = str.maketrans({'"': "'"})
+
+
+class RenderContext:
+    """Precomputed state shared by the formatters in one render pass.
+
+    Each formatter independently recomputed the timestamp, category
+    counts, top-10 windows and joined author lists; generate_all now
+    builds this context once and hands it to every formatter that
+    uses those values.
+    """
+
+    __slots__ = ('generated_at', 'generated_at_iso', 'counts',
+                 'papers_top', 'repos_top', 'news_top', 'disc_top',
+                 'author_strings')
+
+    def __init__(self, data: Dict[str, List[Dict[str, Any]]]):
+        now = datetime.now()
+        self.generated_at = now.strftime('%Y-%m-%d %H:%M:%S')
+        self.generated_at_iso = now.isoformat()
+
+        papers = data.get('papers') or []
+        repositories = data.get('repositories') or []
+        news = data.get('news') or []
+        discussions = data.get('discussions') or []
+
+        self.counts = {
+            'papers': len(papers),
+            'repositories': len(repositories),
+            'news': len(news),
+            'discussions': len(discussions)
+        }
+        self.papers_top = papers[:10]
+        self.repos_top = repositories[:10]
+        self.news_top = news[:10]
+        self.disc_top = discussions[:10]
+        # Shared by the Markdown and HTML paper sections
+        self.author_strings = [
+            ', '.join(paper.get('authors', [])[:5]) for paper in self.papers_top
+        ]
+
 
 class MarkdownFormatter:
     """Generate comprehensive Markdown reports."""
-    
-    def format(self, query: str, data: Dict[str, List[Dict[str, Any]]], analysis: Dict[str, Any]) -> str:
+
+    def format(self, query: str, data: Dict[str, List[Dict[str, Any]]], analysis: Dict[str, Any],
+               ctx: RenderContext = None) -> str:
         """Generate Markdown report."""
-        md = []
-        
+        if ctx is None:
+            ctx = RenderContext(data)
+        # Write straight into one StringIO buffer instead of joining a
+        # list of fragments; hot per-item loops emit a single f-string
+        # per record. Every write carries its own trailing newline (the
+        # old join separator), so the final getvalue() is sliced by one.
+        buf = io.StringIO()
+        write = buf.write
+
         # Header
-        md.append(f"# Research Report: {query}")
-        md.append(f"\n*Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*\n")
-        
+        write(f"# Research Report: {query}\n")
+        write(f"\n*Generated on {ctx.generated_at}*\n\n")
+
         # Executive Summary
-        md.append("## Executive Summary\n")
-        md.append(analysis.get('summary', 'No summary available.'))
-        md.append("\n")
-        
+        write("## Executive Summary\n\n")
+        write(analysis.get('summary', 'No summary available.'))
+        write("\n\n\n")
+
         # Key Findings
         if analysis.get('key_findings'):
-            md.append("## Key Findings\n")
+            write("## Key Findings\n\n")
             for i, finding in enumerate(analysis['key_findings'], 1):
-                md.append(f"{i}. {finding}")
-            md.append("\n")
-        
+                write(f"{i}. {finding}\n")
+            write("\n\n")
+
         # Trends and Patterns
         if analysis.get('trends'):
-            md.append("## Trends and Patterns\n")
-            md.append(str(analysis['trends']))
-            md.append("\n")
-        
+            write("## Trends and Patterns\n\n")
+            write(str(analysis['trends']))
+            write("\n\n\n")
+
         # Academic Papers
-        if data.get('papers'):
-            md.append(f"## Academic Papers ({len(data['papers'])} found)\n")
-            for i, paper in enumerate(data['papers'][:10], 1):
-                md.append(f"### {i}. {paper.get('title', 'N/A')}\n")
-                md.append(f"**Authors:** {', '.join(paper.get('authors', [])[:5])}\n")
-                md.append(f"**Published:** {paper.get('published', 'N/A')}\n")
-                md.append(f"**Link:** [{paper.get('link', '')}]({paper.get('link', '')})\n")
-                md.append(f"**Summary:** {paper.get('summary', '')[:300]}...\n")
-                md.append(f"**Categories:** {', '.join(paper.get('categories', [])[:3])}\n")
-        
+        if ctx.counts['papers']:
+            write(f"## Academic Papers ({ctx.counts['papers']} found)\n\n")
+            for i, paper in enumerate(ctx.papers_top, 1):
+                link = paper.get('link', '')
+                write(
+                    f"### {i}. {paper.get('title', 'N/A')}\n\n"
+                    f"**Authors:** {ctx.author_strings[i - 1]}\n\n"
+                    f"**Published:** {paper.get('published', 'N/A')}\n\n"
+                    f"**Link:** [{link}]({link})\n\n"
+                    f"**Summary:** {paper.get('summary', '')[:300]}...\n\n"
+                    f"**Categories:** {', '.join(paper.get('categories', [])[:3])}\n\n"
+                )
+
         # GitHub Repositories
-        if data.get('repositories'):
-            md.append(f"\n## GitHub Repositories ({len(data['repositories'])} found)\n")
-            for i, repo in enumerate(data['repositories'][:10], 1):
-                md.append(f"### {i}. [{repo.get('title', 'N/A')}]({repo.get('url', '')})\n")
-                md.append(f"**Stars:** ⭐ {repo.get('stars', 0)} | **Language:** {repo.get('language', 'N/A')}\n")
-                md.append(f"**Description:** {repo.get('description', 'No description available.')}\n")
-        
+        if ctx.counts['repositories']:
+            write(f"\n## GitHub Repositories ({ctx.counts['repositories']} found)\n\n")
+            for i, repo in enumerate(ctx.repos_top, 1):
+                write(
+                    f"### {i}. [{repo.get('title', 'N/A')}]({repo.get('url', '')})\n\n"
+                    f"**Stars:** ⭐ {repo.get('stars', 0)} | **Language:** {repo.get('language', 'N/A')}\n\n"
+                    f"**Description:** {repo.get('description', 'No description available.')}\n\n"
+                )
+
         # News & Articles
-        if data.get('news'):
-            md.append(f"\n## News & Articles ({len(data['news'])} found)\n")
-            for i, article in enumerate(data['news'][:10], 1):
-                md.append(f"{i}. [{article.get('title', 'N/A')}]({article.get('url', '')})")
+        if ctx.counts['news']:
+            write(f"\n## News & Articles ({ctx.counts['news']} found)\n\n")
+            for i, article in enumerate(ctx.news_top, 1):
+                write(f"{i}. [{article.get('title', 'N/A')}]({article.get('url', '')})\n")
                 if article.get('score'):
-                    md.append(f" (Score: {article['score']})")
-                md.append(f" - *{article.get('source', 'Unknown')}*\n")
-        
+                    write(f" (Score: {article['score']})\n")
+                write(f" - *{article.get('source', 'Unknown')}*\n\n")
+
         # Discussions
-        if data.get('discussions'):
-            md.append(f"\n## Community Discussions ({len(data['discussions'])} found)\n")
-            for i, disc in enumerate(data['discussions'][:10], 1):
-                md.append(f"{i}. [{disc.get('title', 'N/A')}]({disc.get('url', '')})")
-                md.append(f" - r/{disc.get('subreddit', 'unknown')} ({disc.get('score', 0)} points)\n")
-        
+        if ctx.counts['discussions']:
+            write(f"\n## Community Discussions ({ctx.counts['discussions']} found)\n\n")
+            for i, disc in enumerate(ctx.disc_top, 1):
+                write(
+                    f"{i}. [{disc.get('title', 'N/A')}]({disc.get('url', '')})\n"
+                    f" - r/{disc.get('subreddit', 'unknown')} ({disc.get('score', 0)} points)\n\n"
+                )
+
         # Recommendations
         if analysis.get('recommendations'):
-            md.append("\n## Recommendations\n")
+            write("\n## Recommendations\n\n")
             for i, rec in enumerate(analysis['recommendations'], 1):
-                md.append(f"{i}. {rec}")
-            md.append("\n")
-        
+                write(f"{i}. {rec}\n")
+            write("\n\n")
+
         # Statistics
-        md.append("\n## Statistics\n")
-        md.append(f"- Total Papers: {len(data.get('papers', []))}")
-        md.append(f"- Total Repositories: {len(data.get('repositories', []))}")
-        md.append(f"- Total News Articles: {len(data.get('news', []))}")
-        md.append(f"- Total Discussions: {len(data.get('discussions', []))}")
-        
-        return "\n".join(md)
+        write("\n## Statistics\n\n")
+        write(f"- Total Papers: {ctx.counts['papers']}\n")
+        write(f"- Total Repositories: {ctx.counts['repositories']}\n")
+        write(f"- Total News Articles: {ctx.counts['news']}\n")
+        write(f"- Total Discussions: {ctx.counts['discussions']}\n")
+
+        # Drop the trailing separator after the last fragment
+        return buf.getvalue()[:-1]
 
 
 class JSONFormatter:
     """Generate structured JSON output."""
     
-    def format(self, query: str, data: Dict[str, List[Dict[str, Any]]], analysis: Dict[str, Any]) -> str:
+    def format(self, query: str, data: Dict[str, List[Dict[str, Any]]], analysis: Dict[str, Any],
+               ctx: RenderContext = None) -> str:
         """Generate JSON report."""
+        if ctx is None:
+            ctx = RenderContext(data)
         output = {
             "query": query,
-            "generated_at": datetime.now().isoformat(),
+            "generated_at": ctx.generated_at_iso,
             "analysis": analysis,
             "data": data,
             "statistics": {
-                "total_papers": len(data.get('papers', [])),
-                "total_repositories": len(data.get('repositories', [])),
-                "total_news": len(data.get('news', [])),
-                "total_discussions": len(data.get('discussions', []))
+                "total_papers": ctx.counts['papers'],
+                "total_repositories": ctx.counts['repositories'],
+                "total_news": ctx.counts['news'],
+                "total_discussions": ctx.counts['discussions']
             }
         }
-        return json.dumps(output, indent=2, ensure_ascii=False)
+        # orjson serializes in native code; indent matches the old
+        # stdlib indent=2 layout and non-ASCII passes through unescaped
+        # as ensure_ascii=False did
+        return orjson.dumps(
+            output,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        ).decode()
 
 
 class HTMLFormatter:
     """Generate interactive HTML dashboard."""
     
-    def format(self, query: str, data: Dict[str, List[Dict[str, Any]]], analysis: Dict[str, Any]) -> str:
+    def format(self, query: str, data: Dict[str, List[Dict[str, Any]]], analysis: Dict[str, Any],
+               ctx: RenderContext = None) -> str:
         """Generate HTML dashboard."""
-        html = f"""<!DOCTYPE html>
+        if ctx is None:
+            ctx = RenderContext(data)
+        # Collect fragments and join once at the end; += concatenation
+        # in the per-item loops is worst-case quadratic and only fast
+        # on CPython's refcount special case
+        header = f"""<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -222,7 +301,7 @@ class HTMLFormatter:
 <body>
     <div class="header">
         <h1>Research Report: {query}</h1>
-        <p>Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
+        <p>Generated on {ctx.generated_at}</p>
     </div>
     
     <div class="summary">
@@ -232,63 +311,64 @@ class HTMLFormatter:
     
     <div class="stats">
         <div class="stat-card">
-            <div class="number">{len(data.get('papers', []))}</div>
+            <div class="number">{ctx.counts['papers']}</div>
             <div class="label">Academic Papers</div>
         </div>
         <div class="stat-card">
-            <div class="number">{len(data.get('repositories', []))}</div>
+            <div class="number">{ctx.counts['repositories']}</div>
             <div class="label">GitHub Repos</div>
         </div>
         <div class="stat-card">
-            <div class="number">{len(data.get('news', []))}</div>
+            <div class="number">{ctx.counts['news']}</div>
             <div class="label">News Articles</div>
         </div>
         <div class="stat-card">
-            <div class="number">{len(data.get('discussions', []))}</div>
+            <div class="number">{ctx.counts['discussions']}</div>
             <div class="label">Discussions</div>
         </div>
     </div>
 """
-        
+        parts = [header]
+
         # Key Findings
         if analysis.get('key_findings'):
-            html += '    <div class="section">\n'
-            html += '        <h2>Key Findings</h2>\n'
-            html += '        <ul>\n'
+            parts.append('    <div class="section">\n')
+            parts.append('        <h2>Key Findings</h2>\n')
+            parts.append('        <ul>\n')
             for finding in analysis['key_findings']:
-                html += f'            <li>{finding}</li>\n'
-            html += '        </ul>\n'
-            html += '    </div>\n'
-        
+                parts.append(f'            <li>{finding}</li>\n')
+            parts.append('        </ul>\n')
+            parts.append('    </div>\n')
+
         # Papers
-        if data.get('papers'):
-            html += '    <div class="section">\n'
-            html += f'        <h2>Academic Papers ({len(data["papers"])} found)</h2>\n'
-            for paper in data['papers'][:10]:
-                html += '        <div class="item">\n'
-                html += f'            <h3><a href="{paper.get("link", "")}" target="_blank">{paper.get("title", "N/A")}</a></h3>\n'
-                html += f'            <p><strong>Authors:</strong> {", ".join(paper.get("authors", [])[:5])}</p>\n'
-                html += f'            <p>{paper.get("summary", "")[:300]}...</p>\n'
-                html += '        </div>\n'
-            html += '    </div>\n'
-        
+        if ctx.counts['papers']:
+            parts.append('    <div class="section">\n')
+            parts.append(f'        <h2>Academic Papers ({ctx.counts["papers"]} found)</h2>\n')
+            for i, paper in enumerate(ctx.papers_top):
+                parts.append('        <div class="item">\n')
+                parts.append(f'            <h3><a href="{paper.get("link", "")}" target="_blank">{paper.get("title", "N/A")}</a></h3>\n')
+                parts.append(f'            <p><strong>Authors:</strong> {ctx.author_strings[i]}</p>\n')
+                parts.append(f'            <p>{paper.get("summary", "")[:300]}...</p>\n')
+                parts.append('        </div>\n')
+            parts.append('    </div>\n')
+
         # Repositories
-        if data.get('repositories'):
-            html += '    <div class="section">\n'
-            html += f'        <h2>GitHub Repositories ({len(data["repositories"])} found)</h2>\n'
-            for repo in data['repositories'][:10]:
-                html += '        <div class="item">\n'
-                html += f'            <h3><a href="{repo.get("url", "")}" target="_blank">{repo.get("title", "N/A")}</a></h3>\n'
-                html += f'            <p>⭐ {repo.get("stars", 0)} stars | Language: {repo.get("language", "N/A")}</p>\n'
-                html += f'            <p>{repo.get("description", "No description available.")}</p>\n'
-                html += '        </div>\n'
-            html += '    </div>\n'
-        
-        html += """
+        if ctx.counts['repositories']:
+            parts.append('    <div class="section">\n')
+            parts.append(f'        <h2>GitHub Repositories ({ctx.counts["repositories"]} found)</h2>\n')
+            for repo in ctx.repos_top:
+                parts.append('        <div class="item">\n')
+                parts.append(f'            <h3><a href="{repo.get("url", "")}" target="_blank">{repo.get("title", "N/A")}</a></h3>\n')
+                parts.append(f'            <p>⭐ {repo.get("stars", 0)} stars | Language: {repo.get("language", "N/A")}</p>\n')
+                parts.append(f'            <p>{repo.get("description", "No description available.")}</p>\n')
+                parts.append('        </div>\n')
+            parts.append('    </div>\n')
+
+        parts.append("""
 </body>
 </html>
-"""
-        return html
+""")
+        return "".join(parts)
 
 
 class BibTeXFormatter:
@@ -305,7 +385,7 @@ class BibTeXFormatter:
             if link:
                 # Extract ID from various arXiv URL formats
                 # http://arxiv.org/abs/1234.5678 or https://arxiv.org/abs/1234.5678v2
-                match = re.search(r'arxiv.org/abs/(\d+\.\d+)', link)
+                match = _ARXIV_ID_RE.search(link)
                 if match:
                     arxiv_id = match.group(1)
             
@@ -329,79 +409,81 @@ class CSVFormatter:
         """Generate CSV file."""
         output = io.StringIO()
         writer = csv.writer(output)
-        
-        # Write papers
+
         writer.writerow(['Type', 'Title', 'Authors/Description', 'URL', 'Date/Stars', 'Source'])
-        
-        for paper in data.get('papers', []):
-            writer.writerow([
-                'Paper',
-                paper.get('title', ''),
-                ', '.join(paper.get('authors', [])[:3]),
-                paper.get('link', ''),
-                paper.get('published', ''),
-                paper.get('source', '')
-            ])
-        
-        for repo in data.get('repositories', []):
-            writer.writerow([
-                'Repository',
-                repo.get('title', ''),
-                repo.get('description', ''),
-                repo.get('url', ''),
-                str(repo.get('stars', 0)),
-                repo.get('source', '')
-            ])
-        
-        for article in data.get('news', []):
-            writer.writerow([
-                'News',
-                article.get('title', ''),
-                '',
-                article.get('url', ''),
-                article.get('published', ''),
-                article.get('source', '')
-            ])
-        
+
+        # writerows drains each generator in the csv module's C loop,
+        # one dispatch per section instead of one per row
+        writer.writerows(
+            ('Paper',
+             paper.get('title', ''),
+             ', '.join(paper.get('authors', [])[:3]),
+             paper.get('link', ''),
+             paper.get('published', ''),
+             paper.get('source', ''))
+            for paper in data.get('papers', ())
+        )
+
+        writer.writerows(
+            ('Repository',
+             repo.get('title', ''),
+             repo.get('description', ''),
+             repo.get('url', ''),
+             str(repo.get('stars', 0)),
+             repo.get('source', ''))
+            for repo in data.get('repositories', ())
+        )
+
+        writer.writerows(
+            ('News',
+             article.get('title', ''),
+             '',
+             article.get('url', ''),
+             article.get('published', ''),
+             article.get('source', ''))
+            for article in data.get('news', ())
+        )
+
         return output.getvalue()
 
 
 class MermaidFormatter:
     """Generate Mermaid knowledge graph."""
     
-    def format(self, query: str, data: Dict[str, List[Dict[str, Any]]], analysis: Dict[str, Any]) -> str:
+    def format(self, query: str, data: Dict[str, List[Dict[str, Any]]], analysis: Dict[str, Any],
+               ctx: RenderContext = None) -> str:
         """Generate Mermaid diagram."""
+        if ctx is None:
+            ctx = RenderContext(data)
         mermaid = ["graph TD"]
         mermaid.append(f'    QUERY["{query}"]')
-        
+
         # Add categories
-        if data.get('papers'):
-            mermaid.append(f'    PAPERS["Papers: {len(data["papers"])}"]')
+        if ctx.counts['papers']:
+            mermaid.append(f'    PAPERS["Papers: {ctx.counts["papers"]}"]')
             mermaid.append('    QUERY --> PAPERS')
-        
-        if data.get('repositories'):
-            mermaid.append(f'    REPOS["Repositories: {len(data["repositories"])}"]')
+
+        if ctx.counts['repositories']:
+            mermaid.append(f'    REPOS["Repositories: {ctx.counts["repositories"]}"]')
             mermaid.append('    QUERY --> REPOS')
-        
-        if data.get('news'):
-            mermaid.append(f'    NEWS["News: {len(data["news"])}"]')
+
+        if ctx.counts['news']:
+            mermaid.append(f'    NEWS["News: {ctx.counts["news"]}"]')
             mermaid.append('    QUERY --> NEWS')
-        
-        if data.get('discussions'):
-            mermaid.append(f'    DISC["Discussions: {len(data["discussions"])}"]')
+
+        if ctx.counts['discussions']:
+            mermaid.append(f'    DISC["Discussions: {ctx.counts["discussions"]}"]')
             mermaid.append('    QUERY --> DISC')
-        
+
         # Add top items
-        for i, paper in enumerate(data.get('papers', [])[:3], 1):
-            title = paper.get('title', '')[:30].replace('"', "'")
-            mermaid.append(f'    P{i}["{title}..."]')
-            mermaid.append(f'    PAPERS --> P{i}')
-        
-        for i, repo in enumerate(data.get('repositories', [])[:3], 1):
-            title = repo.get('title', '')[:30].replace('"', "'")
-            mermaid.append(f'    R{i}["{title}"]')
-            mermaid.append(f'    REPOS --> R{i}')
-        
+        for i, paper in enumerate(ctx.papers_top[:3], 1):
+            title = paper.get('title', '')[:30].translate(_MERMAID_QUOTE_TRANS)
+            mermaid.append(f'    P{i}["{title}..."]\n    PAPERS --> P{i}')
+
+        for i, repo in enumerate(ctx.repos_top[:3], 1):
+            title = repo.get('title', '')[:30].translate(_MERMAID_QUOTE_TRANS)
+            mermaid.append(f'    R{i}["{title}"]\n    REPOS --> R{i}')
+
         return "\n".join(mermaid)
 
 
@@ -419,12 +501,21 @@ class OutputFormatter:
     def generate_all(self, query: str, data: Dict[str, List[Dict[str, Any]]], analysis: Dict[str, Any]) -> Dict[str, str]:
         """Generate all output formats."""
         logger.info("Generating all output formats")
-        
-        return {
-            'markdown': self.markdown.format(query, data, analysis),
-            'json': self.json.format(query, data, analysis),
-            'html': self.html.format(query, data, analysis),
-            'bibtex': self.bibtex.format(query, data, analysis),
-            'csv': self.csv.format(query, data, analysis),
-            'mermaid': self.mermaid.format(query, data, analysis)
-        }
+
+        # One shared context: timestamp, counts, windows and author
+        # strings are computed once instead of once per formatter.
+        # The formatters are independent and read-only over their
+        # inputs, so they run concurrently; the context is built
+        # before submission so no formatter races to create it.
+        ctx = RenderContext(data)
+
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            futures = {
+                'markdown': executor.submit(self.markdown.format, query, data, analysis, ctx=ctx),
+                'json': executor.submit(self.json.format, query, data, analysis, ctx=ctx),
+                'html': executor.submit(self.html.format, query, data, analysis, ctx=ctx),
+                'bibtex': executor.submit(self.bibtex.format, query, data, analysis),
+                'csv': executor.submit(self.csv.format, query, data, analysis),
+                'mermaid': executor.submit(self.mermaid.format, query, data, analysis, ctx=ctx)
+            }
+            return {name: future.result() for name, future in futures.items()}
@@ -111,6 +111,20 @@ class TestEvaluationMetrics(unittest.TestCase):
         scores = [c['metrics']['overall'] for c in comparison['comparisons']]
         self.assertEqual(scores, sorted(scores, reverse=True))
 
+    def test_compare_responses_parallel(self):
+        """Test that parallel scoring matches sequential scoring."""
+        query = "What is AI?"
+        responses = [
+            {"model": "model1", "response": "AI is artificial intelligence."},
+            {"model": "model2", "response": "Artificial intelligence (AI) is the simulation of human intelligence."},
+            {"model": "model3", "response": "Short."}
+        ]
+
+        sequential = EvaluationMetrics.compare_responses(responses, query)
+        parallel = EvaluationMetrics.compare_responses(responses, query, parallelism=4)
+
+        self.assertEqual(sequential, parallel)
+
 
 if __name__ == '__main__':
     unittest.main()
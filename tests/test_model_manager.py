@@ -59,6 +59,62 @@ class TestModelManager(unittest.TestCase):
         self.assertEqual(manager.select_best_model("fast"), "phi")
 
 
+class TestBatchInference(unittest.TestCase):
+    """Test the micro-batching layer on ModelManager."""
+
+    def _manager_with_mock_model(self):
+        manager = ModelManager()
+        mock_model = Mock()
+        mock_model.generate.side_effect = lambda prompt, **kw: f"answer: {prompt}"
+        manager.models["llama"] = mock_model
+        return manager, mock_model
+
+    def test_generate_inside_batch_context(self):
+        """generate() inside batch_inference returns the model output."""
+        manager, mock_model = self._manager_with_mock_model()
+
+        with manager.batch_inference(max_latency_ms=10, max_batch_size=4):
+            result = manager.generate("prompt one", model_name="llama")
+
+        self.assertEqual(result, "answer: prompt one")
+        mock_model.generate.assert_called_once()
+
+    def test_generate_outside_context_unchanged(self):
+        """generate() without an active batcher dispatches directly."""
+        manager, _ = self._manager_with_mock_model()
+
+        result = manager.generate("direct", model_name="llama")
+
+        self.assertEqual(result, "answer: direct")
+
+    def test_generate_batch_preserves_order(self):
+        """generate_batch returns results aligned with the input prompts."""
+        manager, mock_model = self._manager_with_mock_model()
+        prompts = [f"q{i}" for i in range(3)]
+
+        results = manager.generate_batch(prompts, model_name="llama")
+
+        self.assertEqual(results, [f"answer: {p}" for p in prompts])
+        self.assertEqual(mock_model.generate.call_count, 3)
+        self.assertEqual(manager.generate_batch([]), [])
+
+    def test_concurrent_calls_are_coalesced(self):
+        """Concurrent generate() calls all complete with correct results."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        manager, mock_model = self._manager_with_mock_model()
+        prompts = [f"q{i}" for i in range(4)]
+
+        with manager.batch_inference(max_latency_ms=50, max_batch_size=4):
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                results = list(pool.map(
+                    lambda p: manager.generate(p, model_name="llama"), prompts
+                ))
+
+        self.assertEqual(results, [f"answer: {p}" for p in prompts])
+        self.assertEqual(mock_model.generate.call_count, 4)
+
+
 class TestOllamaModel(unittest.TestCase):
     """Test OllamaModel functionality."""
     
@@ -86,7 +142,7 @@ class TestOllamaModel(unittest.TestCase):
         model = OllamaModel(config)
         model.load()  # Should not raise
     
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_ollama_generate_success(self, mock_post):
         """Test Ollama generation with mocked response."""
         config = ModelConfig(
@@ -95,19 +151,48 @@ class TestOllamaModel(unittest.TestCase):
             model_path="test:latest"
         )
         
-        # Mock successful response
-        mock_response = Mock()
-        mock_response.json.return_value = {"response": "Generated text"}
+        # Mock successful streaming response
+        mock_response = MagicMock()
+        mock_response.__enter__.return_value = mock_response
         mock_response.raise_for_status = Mock()
+        mock_response.iter_lines.return_value = [
+            b'{"response": "Generated", "done": false}',
+            b'{"response": " text", "done": true}',
+        ]
         mock_post.return_value = mock_response
-        
+
         model = OllamaModel(config)
         result = model.generate("Test prompt")
-        
+
         self.assertEqual(result, "Generated text")
         mock_post.assert_called_once()
     
-    @patch('requests.post')
+    @patch('requests.Session.post')
+    def test_ollama_generate_stream(self, mock_post):
+        """Test Ollama streaming yields chunks until done."""
+        config = ModelConfig(
+            name="test",
+            model_type="ollama",
+            model_path="test:latest"
+        )
+
+        mock_response = MagicMock()
+        mock_response.__enter__.return_value = mock_response
+        mock_response.raise_for_status = Mock()
+        mock_response.iter_lines.return_value = [
+            b'{"response": "Hello", "done": false}',
+            b'',
+            b'{"response": " world", "done": true}',
+        ]
+        mock_post.return_value = mock_response
+
+        model = OllamaModel(config)
+        chunks = list(model.generate_stream("Test prompt"))
+
+        self.assertEqual(chunks, ["Hello", " world"])
+        self.assertTrue(mock_post.call_args.kwargs.get("stream"))
+
+    @patch('requests.Session.post')
     def test_ollama_generate_error(self, mock_post):
         """Test Ollama generation with error."""
         config = ModelConfig(
@@ -0,0 +1,67 @@
+"""Unit tests for the research agent (mocking model generation)."""
+
+import unittest
+from unittest.mock import Mock
+from pathlib import Path
+import sys
+import tempfile
+
+# Add src to path for direct test execution (when not installed via pip)
+_src_path = str(Path(__file__).parent.parent / 'src')
+if _src_path not in sys.path:
+    sys.path.insert(0, _src_path)
+
+from autonomous_agent.agents.research_agent import ResearchAgent
+from autonomous_agent.config import Config, set_config
+
+
+def _make_agent(response: str = "test response") -> ResearchAgent:
+    """Create an agent with RAG disabled and a mocked model manager."""
+    config = Config.load_default()
+    config.agent.enable_rag = False
+    config.agent.feedback_storage_path = tempfile.mkdtemp()
+    set_config(config)
+
+    manager = Mock()
+    manager.select_best_model.return_value = "llama"
+    manager.generate.return_value = response
+    manager.list_loaded_models.return_value = []
+
+    return ResearchAgent(model_manager=manager)
+
+
+class TestResearchAgentCache(unittest.TestCase):
+    """Test the exact-match response cache."""
+
+    def test_repeat_query_hits_cache(self):
+        """Repeating a query should not re-invoke the model."""
+        agent = _make_agent()
+
+        first = agent.research("What is RAG?", use_rag=False)
+        second = agent.research("What is RAG?", use_rag=False)
+
+        self.assertEqual(first["response"], second["response"])
+        self.assertEqual(agent.model_manager.generate.call_count, 1)
+
+    def test_cached_result_is_a_copy(self):
+        """Mutating a returned result must not corrupt the cache."""
+        agent = _make_agent()
+
+        first = agent.research("What is RAG?", use_rag=False)
+        first["response"] = "mutated"
+        second = agent.research("What is RAG?", use_rag=False)
+
+        self.assertEqual(second["response"], "test response")
+
+    def test_different_flags_miss_cache(self):
+        """Different use_rag or model flags should be cached separately."""
+        agent = _make_agent()
+
+        agent.research("What is RAG?", use_rag=False)
+        agent.research("What is RAG?", use_rag=False, model_name="phi")
+
+        self.assertEqual(agent.model_manager.generate.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
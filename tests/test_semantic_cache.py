@@ -0,0 +1,126 @@
+"""Unit tests for the LSH semantic cache."""
+
+import types
+import unittest
+from pathlib import Path
+from unittest import mock
+import sys
+
+import numpy as np
+
+# Add src to path for direct test execution (when not installed via pip)
+_src_path = str(Path(__file__).parent.parent / 'src')
+if _src_path not in sys.path:
+    sys.path.insert(0, _src_path)
+
+from autonomous_agent.rag import semantic_cache
+from autonomous_agent.rag.semantic_cache import SemanticCache
+
+
+class _FakeHnswIndex:
+    """Brute-force stand-in for hnswlib.Index with the same interface."""
+
+    def __init__(self, space, dim):
+        self.space = space
+        self.dim = dim
+        self._vectors = {}
+
+    def init_index(self, max_elements, ef_construction, M):
+        self.max_elements = max_elements
+
+    def add_items(self, matrix, labels):
+        for vector, label in zip(np.atleast_2d(matrix), labels):
+            self._vectors[int(label)] = np.asarray(vector, dtype=np.float32)
+
+    def knn_query(self, vector, k=1):
+        query = np.asarray(vector, dtype=np.float32).reshape(-1)
+        labels = sorted(self._vectors)
+        similarities = [float(self._vectors[label] @ query) for label in labels]
+        best = int(np.argmax(similarities))
+        return (
+            np.array([[labels[best]]]),
+            np.array([[1.0 - similarities[best]]], dtype=np.float32),
+        )
+
+
+class TestSemanticCache(unittest.TestCase):
+    """Test semantic cache lookups."""
+
+    def test_exact_vector_hits(self):
+        """An identical embedding should return the cached value."""
+        cache = SemanticCache(dimension=8)
+        vector = np.ones(8, dtype=np.float32)
+
+        cache.add(vector, {"response": "cached"})
+        result = cache.get(vector)
+
+        self.assertIsNotNone(result)
+        self.assertEqual(result["response"], "cached")
+        self.assertEqual(cache.hits, 1)
+
+    def test_near_duplicate_hits(self):
+        """A slightly perturbed embedding should still hit."""
+        rng = np.random.default_rng(42)
+        cache = SemanticCache(dimension=64)
+        vector = rng.standard_normal(64).astype(np.float32)
+
+        cache.add(vector, {"response": "cached"})
+        noisy = vector + rng.standard_normal(64).astype(np.float32) * 0.01
+        result = cache.get(noisy)
+
+        self.assertIsNotNone(result)
+
+    def test_dissimilar_vector_misses(self):
+        """An orthogonal embedding should miss."""
+        cache = SemanticCache(dimension=8)
+        vector = np.zeros(8, dtype=np.float32)
+        vector[0] = 1.0
+        other = np.zeros(8, dtype=np.float32)
+        other[4] = 1.0
+
+        cache.add(vector, {"response": "cached"})
+        result = cache.get(other)
+
+        self.assertIsNone(result)
+        self.assertEqual(cache.misses, 1)
+
+    def test_clear_drops_entries(self):
+        """Clearing the cache should invalidate stored entries."""
+        cache = SemanticCache(dimension=8)
+        vector = np.ones(8, dtype=np.float32)
+
+        cache.add(vector, {"response": "cached"})
+        cache.clear()
+
+        self.assertIsNone(cache.get(vector))
+        self.assertEqual(cache.get_statistics()["entries"], 0)
+
+    def test_hnsw_lookup_branch(self):
+        """Past the crossover, lookups should be served by the HNSW graph."""
+        fake_hnswlib = types.SimpleNamespace(Index=_FakeHnswIndex)
+        with mock.patch.object(semantic_cache, '_HAS_HNSWLIB', True), \
+                mock.patch.object(semantic_cache, 'hnswlib', fake_hnswlib,
+                                  create=True):
+            rng = np.random.default_rng(7)
+            cache = SemanticCache(dimension=16, max_entries=8)
+            vectors = rng.standard_normal((4, 16)).astype(np.float32)
+
+            # Crossover is max_entries // 2 == 4, so the fourth add
+            # triggers the graph build
+            for i, vector in enumerate(vectors):
+                cache.add(vector, {"response": f"cached-{i}"})
+            self.assertIsNotNone(cache._hnsw)
+
+            result = cache.get(vectors[2])
+            self.assertIsNotNone(result)
+            self.assertEqual(result["response"], "cached-2")
+            self.assertEqual(cache.hits, 1)
+
+            # Entries added after the build go straight into the graph
+            extra = rng.standard_normal(16).astype(np.float32)
+            cache.add(extra, {"response": "cached-4"})
+            self.assertEqual(cache.get(extra)["response"], "cached-4")
+
+
+if __name__ == '__main__':
+    unittest.main()
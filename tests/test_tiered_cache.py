@@ -0,0 +1,64 @@
+"""Unit tests for the tiered response cache."""
+
+import unittest
+from pathlib import Path
+import sys
+
+# Add src to path for direct test execution (when not installed via pip)
+_src_path = str(Path(__file__).parent.parent / 'src')
+if _src_path not in sys.path:
+    sys.path.insert(0, _src_path)
+
+from autonomous_agent.utils.tiered_cache import TieredCache
+
+
+class TestTieredCache(unittest.TestCase):
+    """Test TieredCache storage, expiry, and invalidation."""
+
+    def test_put_and_get(self):
+        """Stored values are returned on lookup."""
+        cache = TieredCache(max_entries=4)
+
+        cache.put("key", {"answer": 42})
+
+        self.assertEqual(cache.get("key"), {"answer": 42})
+        self.assertIsNone(cache.get("missing"))
+
+    def test_expired_entry_misses(self):
+        """Entries past their TTL are dropped on lookup."""
+        cache = TieredCache(max_entries=4, ttl_seconds=0.0)
+
+        cache.put("key", "value")
+
+        self.assertIsNone(cache.get("key"))
+        self.assertEqual(len(cache), 0)
+
+    def test_eviction_respects_capacity(self):
+        """Inserting beyond capacity evicts down to max_entries."""
+        cache = TieredCache(max_entries=2)
+
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.put("c", 3)
+
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.get("c"), 3)
+
+    def test_remove_by_doc_id(self):
+        """Entries tagged with a document ID are invalidated together."""
+        cache = TieredCache(max_entries=4)
+
+        cache.put("a", 1, doc_ids={"doc-1", "doc-2"})
+        cache.put("b", 2, doc_ids={"doc-2"})
+        cache.put("c", 3, doc_ids={"doc-3"})
+
+        removed = cache.remove_by_doc_id("doc-2")
+
+        self.assertEqual(removed, 2)
+        self.assertIsNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()